@@ -49,18 +49,20 @@ class ActionDetector:
             r'\b(?:0?[1-9]|1[0-2])\s*(?:am|pm|AM|PM)\b'
         ]
     
-    def detect_actions(self, email):
+    def detect_actions(self, email, in_place=False):
         """
         Detect actionable items in an email.
         
         Args:
             email (dict): Email data
+            in_place (bool): Add the action data to the given email instead of a copy
             
         Returns:
             dict: Email with added action data
         """
-        # Make a copy of the email to avoid modifying the original
-        email_with_actions = email.copy()
+        # Make a copy of the email to avoid modifying the original, unless
+        # the caller owns it (e.g. a copy made by an earlier pipeline stage)
+        email_with_actions = email if in_place else email.copy()
         
         # Get email content
         subject = email.get('subject', '')
@@ -0,0 +1,11 @@
+"""
+Shared pytest configuration for the Email Management AI Agent tests.
+"""
+
+import sys
+import pathlib
+
+# Add the project root (the directory containing src) to the Python path once
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
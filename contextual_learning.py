@@ -8,6 +8,7 @@ import os
 import datetime
 import numpy as np
 from collections import defaultdict, Counter
+from json_utils import encode_json
 
 class ContextualLearningSystem:
     """
@@ -55,7 +56,7 @@ class ContextualLearningSystem:
         """
         if os.path.exists(self.model_path):
             try:
-                with open(self.model_path, 'r') as f:
+                with open(self.model_path, 'r', encoding='utf-8') as f:
                     return json.load(f)
             except Exception as e:
                 print(f"Error loading user model: {e}")
@@ -134,9 +135,12 @@ class ContextualLearningSystem:
             # Update timestamp
             self.user_model['updated_at'] = datetime.datetime.now().isoformat()
             
-            # Save to file
-            with open(self.model_path, 'w') as f:
-                json.dump(self.user_model, f, indent=2)
+            # Encode in one call before opening the file, so a failed encode
+            # leaves the previous model intact, then write it at once
+            data = encode_json(self.user_model)
+            
+            with open(self.model_path, 'wb') as f:
+                f.write(data)
             
             return True
         except Exception as e:
@@ -30,19 +30,21 @@ class EmailSummarizer:
         
         self.stop_words = set(stopwords.words('english'))
     
-    def summarize_email(self, email, max_sentences=3):
+    def summarize_email(self, email, max_sentences=3, in_place=False):
         """
         Generate a concise summary of an email.
         
         Args:
             email (dict): Email data to summarize
             max_sentences (int): Maximum number of sentences in the summary
+            in_place (bool): Add the summary to the given email instead of a copy
             
         Returns:
             dict: Email with added summary
         """
-        # Make a copy of the email to avoid modifying the original
-        summarized_email = email.copy()
+        # Make a copy of the email to avoid modifying the original, unless
+        # the caller owns it (e.g. a copy made by an earlier pipeline stage)
+        summarized_email = email if in_place else email.copy()
         
         # Get email body text
         body = email.get('body', '')
@@ -112,17 +114,24 @@ class EmailSummarizer:
         if len(sentences) <= max_sentences:
             return text
         
-        # Tokenize words and remove stop words
-        words = [word.lower() for word in word_tokenize(text) if word.isalnum() and word.lower() not in self.stop_words]
+        # Tokenize each sentence once; the tokens are used both for the word
+        # frequencies and for scoring the sentences
+        sentence_words = [word_tokenize(sentence.lower()) for sentence in sentences]
+        
+        # Remove stop words
+        words = [
+            word for tokens in sentence_words for word in tokens
+            if word.isalnum() and word not in self.stop_words
+        ]
         
         # Calculate word frequencies
         freq_dist = FreqDist(words)
         
         # Score sentences based on word frequencies
         sentence_scores = {}
-        for i, sentence in enumerate(sentences):
+        for i, tokens in enumerate(sentence_words):
             score = 0
-            for word in word_tokenize(sentence.lower()):
+            for word in tokens:
                 if word in freq_dist:
                     score += freq_dist[word]
             sentence_scores[i] = score
@@ -0,0 +1,43 @@
+"""
+JSON helpers for the Email Management AI Agent.
+Encodes the data files saved by the learning and notification systems.
+"""
+
+import json
+
+# Optional faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def encode_json(data):
+    """
+    Encode data as indented JSON in a single call.
+    
+    orjson is only used for data it encodes the same way as json.dumps, so
+    the saved values do not depend on whether it is installed. Anything
+    json.dumps would reject is still rejected.
+    
+    Args:
+        data (dict): Data to encode
+        
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            # Datetimes and dataclasses are passed through, since json rejects them
+            encoded = orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        except TypeError:
+            # Non-str keys, numpy values and the like are left to json to encode or reject
+            encoded = None
+        
+        # orjson writes NaN and infinity as null, where json keeps them
+        if encoded is not None and b'null' not in encoded:
+            return encoded
+    
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
@@ -9,6 +9,7 @@ import threading
 import json
 import os
 from collections import defaultdict
+from json_utils import encode_json
 
 class ProactiveNotificationSystem:
     """
@@ -60,7 +61,7 @@ class ProactiveNotificationSystem:
         """
         if os.path.exists(self.settings_path):
             try:
-                with open(self.settings_path, 'r') as f:
+                with open(self.settings_path, 'r', encoding='utf-8') as f:
                     return json.load(f)
             except Exception as e:
                 print(f"Error loading notification settings: {e}")
@@ -198,9 +199,10 @@ class ProactiveNotificationSystem:
             # Update timestamp
             settings['updated_at'] = datetime.datetime.now().isoformat()
             
-            # Save to file
-            with open(self.settings_path, 'w') as f:
-                json.dump(settings, f, indent=2)
+            # Save to file, encoding first so a failed encode keeps the old file
+            data = encode_json(settings)
+            with open(self.settings_path, 'wb') as f:
+                f.write(data)
             
             return True
         except Exception as e:
@@ -216,7 +218,7 @@ class ProactiveNotificationSystem:
         """
         if os.path.exists(self.history_path):
             try:
-                with open(self.history_path, 'r') as f:
+                with open(self.history_path, 'r', encoding='utf-8') as f:
                     return json.load(f)
             except Exception as e:
                 print(f"Error loading notification history: {e}")
@@ -276,9 +278,10 @@ class ProactiveNotificationSystem:
             # Update timestamp
             history['updated_at'] = datetime.datetime.now().isoformat()
             
-            # Save to file
-            with open(self.history_path, 'w') as f:
-                json.dump(history, f, indent=2)
+            # Save to file, encoding first so a failed encode keeps the old file
+            data = encode_json(history)
+            with open(self.history_path, 'wb') as f:
+                f.write(data)
             
             return True
         except Exception as e:
@@ -4,27 +4,36 @@ Detects emotional tone and urgency in emails.
 """
 
 import re
+import copy
 import nltk
 from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from collections import Counter
 
-# Download required NLTK resources
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Required NLTK resources, downloaded on first use rather than at import
+_NLTK_RESOURCES = (
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet')
+)
+_nltk_ready = False
+
+def _ensure_nltk():
+    """
+    Make sure the required NLTK resources are available, downloading them once.
+    """
+    global _nltk_ready
+    if _nltk_ready:
+        return
     
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+    for resource_path, resource_name in _NLTK_RESOURCES:
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            nltk.download(resource_name)
     
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+    _nltk_ready = True
 
 class SentimentAnalyzer:
     """
@@ -35,11 +44,11 @@ class SentimentAnalyzer:
         """
         Initialize the sentiment analyzer.
         """
-        # Initialize NLP components
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
+        # NLP components are created lazily on first use
+        self._stop_words = None
+        self._lemmatizer = None
         
-        # Emotion dictionaries
+        # Emotion dictionaries (urgency is scored separately by _assess_urgency)
         self.emotion_lexicon = {
             'frustration': [
                 'frustrated', 'annoyed', 'irritated', 'upset', 'disappointed', 
@@ -57,14 +66,6 @@ class SentimentAnalyzer:
                 'superb', 'terrific', 'awesome', 'impressive', 'splendid',
                 'success', 'successful', 'achievement', 'accomplish', 'achieved'
             ],
-            'urgency': [
-                'urgent', 'immediately', 'asap', 'as soon as possible', 'right away',
-                'quickly', 'promptly', 'expedite', 'rush', 'hurry', 'swift',
-                'critical', 'crucial', 'vital', 'essential', 'important',
-                'priority', 'time-sensitive', 'deadline', 'due', 'emergency',
-                'pressing', 'imperative', 'now', 'today', 'soon',
-                'cannot wait', 'can\'t wait', 'without delay', 'at once'
-            ],
             'appreciation': [
                 'thank', 'thanks', 'thank you', 'grateful', 'appreciate',
                 'appreciation', 'thankful', 'gratitude', 'indebted', 'obliged',
@@ -90,6 +91,19 @@ class SentimentAnalyzer:
             ]
         }
         
+        # Parallel emotion name / word tuples for counting without per-email dicts
+        self._emotion_names = tuple(self.emotion_lexicon)
+        self._emotion_words = tuple(tuple(words) for words in self.emotion_lexicon.values())
+        
+        # Overall sentiment implied by each primary emotion (others are neutral)
+        self.emotion_sentiment = {
+            'frustration': 'negative',
+            'concern': 'negative',
+            'satisfaction': 'positive',
+            'appreciation': 'positive',
+            'confusion': 'neutral'
+        }
+        
         # Urgency indicators with weights
         self.urgency_indicators = {
             'immediate': [
@@ -139,6 +153,15 @@ class SentimentAnalyzer:
             'workload', 'backlog', 'pile up', 'accumulate', 'mounting'
         ]
         
+        # One character trie over the urgency, passive-aggressive and stress
+        # phrases, so a single pass over the text serves all three detectors
+        scanned_phrases = [indicator for indicators in self.urgency_indicators.values() for indicator, _ in indicators]
+        scanned_phrases += self.passive_aggressive_phrases + self.stress_indicators
+        self._phrase_trie = self._build_phrase_trie(scanned_phrases)
+        
+        # Matches the first character of every word, where phrases may start
+        self._word_start_re = re.compile(r'\b\w')
+        
         # Relationship indicators
         self.relationship_indicators = {
             'positive': [
@@ -164,6 +187,26 @@ class SentimentAnalyzer:
             ]
         }
     
+    @property
+    def stop_words(self):
+        """
+        English stopwords, loaded on first access.
+        """
+        if self._stop_words is None:
+            _ensure_nltk()
+            self._stop_words = set(stopwords.words('english'))
+        return self._stop_words
+    
+    @property
+    def lemmatizer(self):
+        """
+        WordNet lemmatizer, created on first access.
+        """
+        if self._lemmatizer is None:
+            _ensure_nltk()
+            self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+    
     def analyze_sentiment(self, email):
         """
         Analyze sentiment in an email.
@@ -179,23 +222,26 @@ class SentimentAnalyzer:
         body = email.get('body', '')
         sender = email.get('sender', '')
         
-        # Combine subject and body for analysis
-        text = f"{subject}\n{body}"
+        # Combine subject and body for analysis, lowercased once for all detectors
+        text_lower = f"{subject}\n{body}".lower()
+        
+        # Find urgency, passive-aggressive and stress phrases in one scan
+        found_phrases = self._scan_phrases(text_lower)
         
         # Preprocess text
-        preprocessed_text = self._preprocess_text(text)
+        preprocessed_text = self._preprocess_text(text_lower)
         
         # Detect emotions
         emotions = self._detect_emotions(preprocessed_text)
         
         # Assess urgency
-        urgency = self._assess_urgency(text)
+        urgency = self._assess_urgency(text_lower, found_phrases)
         
         # Detect passive-aggressive tone
-        passive_aggressive = self._detect_passive_aggressive(text)
+        passive_aggressive = self._detect_passive_aggressive(text_lower, found_phrases)
         
         # Detect stress indicators
-        stress = self._detect_stress(text)
+        stress = self._detect_stress(text_lower, found_phrases)
         
         # Determine overall sentiment
         overall_sentiment = self._determine_overall_sentiment(emotions, urgency, passive_aggressive)
@@ -212,18 +258,44 @@ class SentimentAnalyzer:
         
         return sentiment_analysis
     
-    def _preprocess_text(self, text):
+    def analyze_sentiments(self, emails):
+        """
+        Analyze sentiment in a batch of emails.
+        
+        Args:
+            emails (list): List of email data dictionaries
+            
+        Returns:
+            list: Sentiment analysis results for each email, in order
+        """
+        # Emails with the same subject and body get the same result, so each
+        # distinct one is analyzed once and repeats get their own copy
+        results_by_text = {}
+        results = []
+        for email in emails:
+            text_key = (email.get('subject', ''), email.get('body', ''))
+            if text_key in results_by_text:
+                results.append(copy.deepcopy(results_by_text[text_key]))
+            else:
+                sentiment_analysis = self.analyze_sentiment(email)
+                results_by_text[text_key] = sentiment_analysis
+                results.append(sentiment_analysis)
+        
+        return results
+    
+    def _preprocess_text(self, text_lower):
         """
         Preprocess text for sentiment analysis.
         
         Args:
-            text (str): Text to preprocess
+            text_lower (str): Lowercased text to preprocess
             
         Returns:
             list: Preprocessed tokens
         """
         # Tokenize text
-        tokens = word_tokenize(text.lower())
+        _ensure_nltk()
+        tokens = word_tokenize(text_lower)
         
         # Remove stopwords and punctuation
         tokens = [token for token in tokens if token.isalnum() and token not in self.stop_words]
@@ -243,25 +315,32 @@ class SentimentAnalyzer:
         Returns:
             dict: Detected emotions with scores
         """
-        # Initialize emotion scores
-        emotion_scores = {emotion: 0 for emotion in self.emotion_lexicon.keys()}
-        
-        # Count emotion words
+        # Count emotion words into a flat list indexed like self._emotion_names
+        emotion_counts = [0] * len(self._emotion_names)
         for token in preprocessed_text:
-            for emotion, words in self.emotion_lexicon.items():
+            for index, words in enumerate(self._emotion_words):
                 if token in words or any(word in token for word in words):
-                    emotion_scores[emotion] += 1
+                    emotion_counts[index] += 1
         
         # Normalize scores
-        total_emotions = sum(emotion_scores.values())
-        if total_emotions > 0:
-            for emotion in emotion_scores:
-                emotion_scores[emotion] = round((emotion_scores[emotion] / len(preprocessed_text)) * 100, 2)
+        if sum(emotion_counts) > 0:
+            token_count = len(preprocessed_text)
+            emotion_counts = [round((count / token_count) * 100, 2) for count in emotion_counts]
+        
+        emotion_scores = dict(zip(self._emotion_names, emotion_counts))
         
-        # Get primary and secondary emotions
-        sorted_emotions = sorted(emotion_scores.items(), key=lambda x: x[1], reverse=True)
-        primary_emotion = sorted_emotions[0][0] if sorted_emotions[0][1] > 0 else 'neutral'
-        secondary_emotion = sorted_emotions[1][0] if len(sorted_emotions) > 1 and sorted_emotions[1][1] > 0 else None
+        # Get primary and secondary emotions in a single pass (ties keep lexicon order)
+        best_index = second_index = None
+        best_score = second_score = -1
+        for index, score in enumerate(emotion_counts):
+            if score > best_score:
+                second_index, second_score = best_index, best_score
+                best_index, best_score = index, score
+            elif score > second_score:
+                second_index, second_score = index, score
+        
+        primary_emotion = self._emotion_names[best_index] if best_score > 0 else 'neutral'
+        secondary_emotion = self._emotion_names[second_index] if second_score > 0 else None
         
         return {
             'primary': primary_emotion,
@@ -269,12 +348,13 @@ class SentimentAnalyzer:
             'scores': emotion_scores
         }
     
-    def _assess_urgency(self, text):
+    def _assess_urgency(self, text_lower, found_phrases=None):
         """
         Assess urgency level in text.
         
         Args:
-            text (str): Text to analyze
+            text_lower (str): Lowercased text to analyze
+            found_phrases (set, optional): Result of _scan_phrases for text_lower, if already computed
             
         Returns:
             dict: Urgency assessment
@@ -284,10 +364,11 @@ class SentimentAnalyzer:
         matched_indicators = []
         
         # Check for urgency indicators
-        text_lower = text.lower()
+        if found_phrases is None:
+            found_phrases = self._scan_phrases(text_lower)
         for category, indicators in self.urgency_indicators.items():
             for indicator, weight in indicators:
-                if re.search(r'\b' + re.escape(indicator) + r'\b', text_lower):
+                if indicator in found_phrases:
                     urgency_score += weight
                     matched_indicators.append(indicator)
         
@@ -309,12 +390,13 @@ class SentimentAnalyzer:
             'indicators': matched_indicators
         }
     
-    def _detect_passive_aggressive(self, text):
+    def _detect_passive_aggressive(self, text_lower, found_phrases=None):
         """
         Detect passive-aggressive tone in text.
         
         Args:
-            text (str): Text to analyze
+            text_lower (str): Lowercased text to analyze
+            found_phrases (set, optional): Result of _scan_phrases for text_lower, if already computed
             
         Returns:
             dict: Passive-aggressive assessment
@@ -324,9 +406,10 @@ class SentimentAnalyzer:
         matched_phrases = []
         
         # Check for passive-aggressive phrases
-        text_lower = text.lower()
+        if found_phrases is None:
+            found_phrases = self._scan_phrases(text_lower)
         for phrase in self.passive_aggressive_phrases:
-            if re.search(r'\b' + re.escape(phrase) + r'\b', text_lower):
+            if phrase in found_phrases:
                 pa_score += 1
                 matched_phrases.append(phrase)
         
@@ -344,12 +427,86 @@ class SentimentAnalyzer:
             'phrases': matched_phrases
         }
     
-    def _detect_stress(self, text):
+    def _scan_phrases(self, text_lower):
+        """
+        Find every urgency, passive-aggressive and stress phrase in text.
+        
+        Args:
+            text_lower (str): Lowercased text to analyze
+            
+        Returns:
+            set: Phrases occurring in the text as whole words
+        """
+        return self._find_phrases(self._phrase_trie, text_lower)
+    
+    def _build_phrase_trie(self, phrases):
+        """
+        Build a character trie from a list of phrases.
+        
+        Args:
+            phrases (list): Phrases to index
+            
+        Returns:
+            dict: Nested dict trie; the None key marks the end of a phrase
+        """
+        trie = {}
+        for phrase in phrases:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[None] = phrase
+        
+        return trie
+    
+    def _find_phrases(self, trie, text):
+        """
+        Find all trie phrases occurring in text as whole words.
+        
+        Args:
+            trie (dict): Trie built by _build_phrase_trie
+            text (str): Text to scan
+            
+        Returns:
+            set: Phrases found in the text
+        """
+        found = set()
+        text_length = len(text)
+        
+        # Phrases must start on a word boundary
+        for word_start in self._word_start_re.finditer(text):
+            node = trie
+            position = word_start.start()
+            while position < text_length:
+                node = node.get(text[position])
+                if node is None:
+                    break
+                position += 1
+                
+                # Phrases must also end on a word boundary
+                if None in node and (position == text_length or not self._is_word_char(text[position])):
+                    found.add(node[None])
+        
+        return found
+    
+    def _is_word_char(self, char):
+        """
+        Check whether a character counts as a word character.
+        
+        Args:
+            char (str): Single character
+            
+        Returns:
+            bool: True if the character is alphanumeric or an underscore
+        """
+        return char.isalnum() or char == '_'
+    
+    def _detect_stress(self, text_lower, found_phrases=None):
         """
         Detect stress indicators in text.
         
         Args:
-            text (str): Text to analyze
+            text_lower (str): Lowercased text to analyze
+            found_phrases (set, optional): Result of _scan_phrases for text_lower, if already computed
             
         Returns:
             dict: Stress assessment
@@ -359,9 +516,10 @@ class SentimentAnalyzer:
         matched_indicators = []
         
         # Check for stress indicators
-        text_lower = text.lower()
+        if found_phrases is None:
+            found_phrases = self._scan_phrases(text_lower)
         for indicator in self.stress_indicators:
-            if re.search(r'\b' + re.escape(indicator) + r'\b', text_lower):
+            if indicator in found_phrases:
                 stress_score += 1
                 matched_indicators.append(indicator)
         
@@ -397,14 +555,7 @@ class SentimentAnalyzer:
         primary_emotion = emotions['primary']
         
         # Determine sentiment based on primary emotion
-        if primary_emotion == 'frustration' or primary_emotion == 'concern':
-            sentiment = 'negative'
-        elif primary_emotion == 'satisfaction' or primary_emotion == 'appreciation':
-            sentiment = 'positive'
-        elif primary_emotion == 'confusion':
-            sentiment = 'neutral'
-        else:
-            sentiment = 'neutral'
+        sentiment = self.emotion_sentiment.get(primary_emotion, 'neutral')
         
         # Adjust sentiment based on urgency and passive-aggressive tone
         i
@@ -5,157 +5,263 @@ Provides AI-generated response suggestions for emails.
 
 import re
 import random
-from datetime import datetime
-import nltk
-from nltk.tokenize import sent_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
 
-# Download required NLTK resources
+# Use Google RE2 (linear-time matching) for the extraction patterns when
+# the optional google-re2 package is installed
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-    
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-    
+    import re2 as _pattern_engine
+except ImportError:
+    _pattern_engine = re
+
+# Optional Aho-Corasick automaton for email type keyword matching
 try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Response templates by email type, shared by all generators
+RESPONSE_TEMPLATES = {
+    'meeting_request': (
+        "I'm available for the meeting on {date} at {time}. Looking forward to discussing {topic}.",
+        "Thank you for the invitation. I can attend the meeting on {date} at {time}.",
+        "I'll be happy to join the discussion about {topic} on {date} at {time}.",
+        "I've added the meeting to my calendar for {date} at {time}. Looking forward to it."
+    ),
+    'task_assignment': (
+        "I'll take care of {task} by {deadline}. I'll update you on the progress.",
+        "Thank you for assigning {task} to me. I'll complete it by {deadline}.",
+        "I'll start working on {task} right away and will have it done by {deadline}.",
+        "I've noted the {task} assignment and will ensure it's completed by {deadline}."
+    ),
+    'information_request': (
+        "Here's the information you requested about {topic}: {info}",
+        "Regarding your question about {topic}, {info}",
+        "I've gathered the details you asked for about {topic}: {info}",
+        "In response to your inquiry about {topic}: {info}"
+    ),
+    'follow_up': (
+        "I wanted to follow up on {topic}. Have you had a chance to review it?",
+        "Just checking in on {topic}. Let me know if you need anything else from me.",
+        "Following up on our discussion about {topic}. Any updates on your end?",
+        "Touching base regarding {topic}. How would you like to proceed?"
+    ),
+    'thank_you': (
+        "Thank you for {action}. I really appreciate it.",
+        "I wanted to express my thanks for {action}.",
+        "Thank you so much for {action}. It's greatly appreciated.",
+        "I appreciate your help with {action}. Thank you."
+    ),
+    'apology': (
+        "I apologize for {issue}. I'll make sure it doesn't happen again.",
+        "I'm sorry about {issue}. Let me know how I can make it right.",
+        "Please accept my apology for {issue}. I understand the inconvenience this caused.",
+        "I sincerely apologize for {issue} and will take steps to address it immediately."
+    ),
+    'acknowledgment': (
+        "I've received your email about {topic} and will review it shortly.",
+        "Thank you for sending the information about {topic}. I'll take a look at it.",
+        "I acknowledge receipt of your message regarding {topic}.",
+        "Got your email about {topic}. I'll get back to you soon with my thoughts."
+    ),
+    'general': (
+        "Thank you for your email. I'll respond in detail soon.",
+        "I've received your message and will get back to you shortly.",
+        "Thanks for reaching out. I'll review this and respond as soon as possible.",
+        "I appreciate your email. I'll prepare a thorough response soon."
+    )
+}
+
+# Quick replies for common situations, shared by all generators
+QUICK_REPLIES = {
+    'confirmation': (
+        "Confirmed, thank you.",
+        "Yes, that works for me.",
+        "Sounds good, I confirm.",
+        "I confirm receipt, thanks."
+    ),
+    'acknowledgment': (
+        "Got it, thanks.",
+        "Received, thank you.",
+        "Thanks for letting me know.",
+        "Noted, appreciate the update."
+    ),
+    'agreement': (
+        "I agree with your suggestion.",
+        "That sounds like a good plan.",
+        "I'm on board with this approach.",
+        "I support this decision."
+    ),
+    'clarification': (
+        "Could you please provide more details about this?",
+        "I need some clarification on this point.",
+        "Could you elaborate on what you mean by this?",
+        "I'm not sure I understand - could you explain further?"
+    ),
+    'scheduling': (
+        "How about meeting next Tuesday at 2 PM?",
+        "Would Wednesday afternoon work for a quick call?",
+        "I'm available this Thursday between 10 AM and 2 PM.",
+        "Let's schedule a 30-minute discussion tomorrow."
+    )
+}
+
+# Email type detection keywords, shared by all generators
+EMAIL_TYPE_PATTERNS = {
+    'meeting_request': (
+        r'meet', r'meeting', r'discuss', r'discussion', r'call',
+        r'schedule', r'calendar', r'availability', r'available',
+        r'zoom', r'teams', r'conference', r'invite'
+    ),
+    'task_assignment': (
+        r'task', r'assignment', r'project', r'deadline', r'complete',
+        r'finish', r'deliver', r'responsibility', r'assigned',
+        r'due date', r'due by', r'action item'
+    ),
+    'information_request': (
+        r'information', r'details', r'data', r'report', r'update',
+        r'status', r'question', r'inquiry', r'clarification',
+        r'explain', r'elaborate', r'provide'
+    ),
+    'follow_up': (
+        r'follow up', r'following up', r'checking in', r'touch base',
+        r'status update', r'progress', r'any updates', r'reminder'
+    ),
+    'thank_you': (
+        r'thank you', r'thanks', r'appreciate', r'grateful',
+        r'recognition', r'acknowledgment'
+    ),
+    'apology': (
+        r'sorry', r'apology', r'apologize', r'regret', r'mistake',
+        r'error', r'inconvenience', r'issue'
+    )
+}
 
 class SmartResponseGenerator:
     """
     Handles generation of AI-powered email response suggestions.
     """
     
+    # Precompiled extraction patterns, shared by all instances. Extraction
+    # runs on lowercased text, so the patterns are lowercase and case-sensitive
+    _subject_prefix_re = re.compile(r'^(Re|Fwd|FW|RE|FWD):\s*')
+    
+    # Maximum number of body characters scanned for email type and key info
+    max_scan_length = 4096
+    
+    # Number of analyzed emails remembered, so repeated bulk mail is not rescanned
+    analysis_cache_size = 2048
+    
+    # Start of quoted previous messages in a reply or forward
+    _reply_cut_re = re.compile(r'\n-{3,}\s*original message|\non .+ wrote:|\n>', re.IGNORECASE)
+    
+    # Key info fields consumed by each email type's templates, besides topic
+    _fields_by_type = {
+        'meeting_request': ('date', 'time'),
+        'task_assignment': ('task', 'deadline'),
+        'thank_you': ('action',),
+        'apology': ('issue',)
+    }
+    
+    # Splits text after sentence-ending punctuation
+    _sent_split_re = re.compile(r'(?<=[.!?])\s+')
+    
+    # Each extractor's patterns form one alternation, so the text is scanned
+    # once and the earliest match in the text wins
+    _date_re = _pattern_engine.compile('|'.join([
+        # MM/DD/YYYY or DD/MM/YYYY
+        r'(?:\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b)',
+        # Month DD, YYYY
+        r'(?:\b(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{2,4}\b)',
+        # DD Month YYYY
+        r'(?:\b\d{1,2}(?:st|nd|rd|th)?\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec),?\s+\d{2,4}\b)',
+        # Next/This Monday, Tuesday, etc.
+        r'(?:\b(?:next|this)\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|wed|thu|fri|sat|sun)\b)',
+        # Tomorrow, day after tomorrow
+        r'(?:\b(?:tomorrow|day after tomorrow)\b)'
+    ]))
+    
+    _time_re = _pattern_engine.compile('|'.join([
+        # HH:MM AM/PM
+        r'(?:\b(?:0?[1-9]|1[0-2]):[0-5][0-9]\s*(?:am|pm)\b)',
+        # Military time
+        r'(?:\b(?:[01]?[0-9]|2[0-3]):[0-5][0-9]\b)',
+        # X AM/PM
+        r'(?:\b(?:0?[1-9]|1[0-2])\s*(?:am|pm)\b)'
+    ]))
+    
+    _deadline_re = _pattern_engine.compile('|'.join([
+        r'(?:due\s+by\s+(.*?)[\.;,])',
+        r'(?:deadline\s+(?:is|of)\s+(.*?)[\.;,])',
+        r'(?:complete\s+by\s+(.*?)[\.;,])',
+        r'(?:finish\s+by\s+(.*?)[\.;,])',
+        r'(?:submit\s+by\s+(.*?)[\.;,])'
+    ]))
+    
+    _task_re = _pattern_engine.compile('|'.join([
+        r'(?:(?:please|kindly|could you|can you)\s+(.*?)[\.;,])',
+        r'(?:(?:assigned|assigning|assign)\s+(?:you|to you)\s+(.*?)[\.;,])',
+        r'(?:(?:task|responsibility)\s+(?:is|of)\s+(.*?)[\.;,])',
+        r'(?:need\s+you\s+to\s+(.*?)[\.;,])',
+        r'(?:would\s+like\s+you\s+to\s+(.*?)[\.;,])'
+    ]))
+    
+    # Patterns combined by _scan_first_matches, and the combined scanners
+    # compiled so far keyed by the tuple of kinds they look for
+    _datetime_sources = {'date': _date_re, 'time': _time_re, 'deadline': _deadline_re}
+    _datetime_scanners = {}
+    
+    # Bytes versions of the patterns, compiled on first use. ASCII-only text
+    # is scanned as bytes, which gives the same spans but skips the Unicode
+    # character checks str patterns make at every word boundary
+    _bytes_patterns = {}
+    
     def __init__(self):
         """
         Initialize the smart response generator.
         """
-        # Initialize NLP components
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
-        
         # Response templates by category
-        self.templates = {
-            'meeting_request': [
-                "I'm available for the meeting on {date} at {time}. Looking forward to discussing {topic}.",
-                "Thank you for the invitation. I can attend the meeting on {date} at {time}.",
-                "I'll be happy to join the discussion about {topic} on {date} at {time}.",
-                "I've added the meeting to my calendar for {date} at {time}. Looking forward to it."
-            ],
-            'task_assignment': [
-                "I'll take care of {task} by {deadline}. I'll update you on the progress.",
-                "Thank you for assigning {task} to me. I'll complete it by {deadline}.",
-                "I'll start working on {task} right away and will have it done by {deadline}.",
-                "I've noted the {task} assignment and will ensure it's completed by {deadline}."
-            ],
-            'information_request': [
-                "Here's the information you requested about {topic}: {info}",
-                "Regarding your question about {topic}, {info}",
-                "I've gathered the details you asked for about {topic}: {info}",
-                "In response to your inquiry about {topic}: {info}"
-            ],
-            'follow_up': [
-                "I wanted to follow up on {topic}. Have you had a chance to review it?",
-                "Just checking in on {topic}. Let me know if you need anything else from me.",
-                "Following up on our discussion about {topic}. Any updates on your end?",
-                "Touching base regarding {topic}. How would you like to proceed?"
-            ],
-            'thank_you': [
-                "Thank you for {action}. I really appreciate it.",
-                "I wanted to express my thanks for {action}.",
-                "Thank you so much for {action}. It's greatly appreciated.",
-                "I appreciate your help with {action}. Thank you."
-            ],
-            'apology': [
-                "I apologize for {issue}. I'll make sure it doesn't happen again.",
-                "I'm sorry about {issue}. Let me know how I can make it right.",
-                "Please accept my apology for {issue}. I understand the inconvenience this caused.",
-                "I sincerely apologize for {issue} and will take steps to address it immediately."
-            ],
-            'acknowledgment': [
-                "I've received your email about {topic} and will review it shortly.",
-                "Thank you for sending the information about {topic}. I'll take a look at it.",
-                "I acknowledge receipt of your message regarding {topic}.",
-                "Got your email about {topic}. I'll get back to you soon with my thoughts."
-            ],
-            'general': [
-                "Thank you for your email. I'll respond in detail soon.",
-                "I've received your message and will get back to you shortly.",
-                "Thanks for reaching out. I'll review this and respond as soon as possible.",
-                "I appreciate your email. I'll prepare a thorough response soon."
-            ]
-        }
+        self.templates = RESPONSE_TEMPLATES
         
         # Quick replies for common situations
-        self.quick_replies = {
-            'confirmation': [
-                "Confirmed, thank you.",
-                "Yes, that works for me.",
-                "Sounds good, I confirm.",
-                "I confirm receipt, thanks."
-            ],
-            'acknowledgment': [
-                "Got it, thanks.",
-                "Received, thank you.",
-                "Thanks for letting me know.",
-                "Noted, appreciate the update."
-            ],
-            'agreement': [
-                "I agree with your suggestion.",
-                "That sounds like a good plan.",
-                "I'm on board with this approach.",
-                "I support this decision."
-            ],
-            'clarification': [
-                "Could you please provide more details about this?",
-                "I need some clarification on this point.",
-                "Could you elaborate on what you mean by this?",
-                "I'm not sure I understand - could you explain further?"
-            ],
-            'scheduling': [
-                "How about meeting next Tuesday at 2 PM?",
-                "Would Wednesday afternoon work for a quick call?",
-                "I'm available this Thursday between 10 AM and 2 PM.",
-                "Let's schedule a 30-minute discussion tomorrow."
-            ]
-        }
+        self.quick_replies = QUICK_REPLIES
         
         # Email type detection patterns
-        self.email_type_patterns = {
-            'meeting_request': [
-                r'meet', r'meeting', r'discuss', r'discussion', r'call',
-                r'schedule', r'calendar', r'availability', r'available',
-                r'zoom', r'teams', r'conference', r'invite'
-            ],
-            'task_assignment': [
-                r'task', r'assignment', r'project', r'deadline', r'complete',
-                r'finish', r'deliver', r'responsibility', r'assigned',
-                r'due date', r'due by', r'action item'
-            ],
-            'information_request': [
-                r'information', r'details', r'data', r'report', r'update',
-                r'status', r'question', r'inquiry', r'clarification',
-                r'explain', r'elaborate', r'provide'
-            ],
-            'follow_up': [
-                r'follow up', r'following up', r'checking in', r'touch base',
-                r'status update', r'progress', r'any updates', r'reminder'
-            ],
-            'thank_you': [
-                r'thank you', r'thanks', r'appreciate', r'grateful',
-                r'recognition', r'acknowledgment'
-            ],
-            'apology': [
-                r'sorry', r'apology', r'apologize', r'regret', r'mistake',
-                r'error', r'inconvenience', r'issue'
-            ]
-        }
+        self.email_type_patterns = EMAIL_TYPE_PATTERNS
+        
+        # Email types in scoring order; scores are tallied in lists indexed
+        # by position here, and ties go to the earlier type
+        self._type_names = tuple(self.email_type_patterns)
+        
+        # Compile each type's patterns into one alternation, in scoring order.
+        # Keywords of different types overlap ('status' and 'status update'),
+        # so each type is scanned on its own to count every whole-word match;
+        # the keywords within one type never overlap each other
+        self._type_unions = tuple(
+            re.compile(r'\b(?:' + '|'.join(patterns) + r')\b')
+            for patterns in self.email_type_patterns.values()
+        )
+        
+        # Fallback date text, cached as (day computed on, text)
+        self._tomorrow_cache = (None, '')
+        
+        # Email type and key info by (subject, scanned body), least recently
+        # used first; cleared daily since the fallback dates depend on today
+        self._analysis_cache = OrderedDict()
+        self._analysis_cache_day = None
+        
+        # The type patterns are plain keywords, so when pyahocorasick is
+        # installed they are matched with a single automaton instead
+        self._type_automaton = None
+        if ahocorasick is not None:
+            self._type_automaton = ahocorasick.Automaton()
+            for type_index, keywords in enumerate(self.email_type_patterns.values()):
+                for keyword in keywords:
+                    self._type_automaton.add_word(keyword, (type_index, len(keyword)))
+            self._type_automaton.make_automaton()
     
     def generate_response(self, email, user_data=None):
         """
@@ -173,12 +279,88 @@ class SmartResponseGenerator:
         body = email.get('body', '')
         sender = email.get('sender', '')
         
-        # Determine email type
-        email_type = self._determine_email_type(subject, body)
+        # Only the new part of the message is analyzed, not quoted replies
+        scan_body = self._get_scan_body(body)
+        
+        # Determine email type and extract key information
+        email_type, key_info = self._analyze_emails([(subject, scan_body)])[0]
         
-        # Extract key information
-        key_info = self._extract_key_info(subject, body, email_type)
+        return self._build_response(email_type, key_info, user_data, sender)
+    
+    def generate_responses(self, emails, user_data=None, workers=None):
+        """
+        Generate response suggestions for a batch of emails, such as a digest.
+        
+        Args:
+            emails (list): List of email data dictionaries
+            user_data (dict, optional): User preferences and history data
+            workers (int, optional): Number of worker processes to spread the
+                batch over; by default it is processed in this process
+            
+        Returns:
+            list: Response suggestions for each email, in order
+        """
+        if workers and workers > 1 and len(emails) > 1:
+            return self._generate_responses_parallel(emails, user_data, workers)
+        
+        # Analyze the whole batch first, so email types are scored in one scan
+        scan_items = [
+            (email.get('subject', ''), self._get_scan_body(email.get('body', '')))
+            for email in emails
+        ]
+        analyses = self._analyze_emails(scan_items)
+        
+        return [
+            self._build_response(email_type, key_info, user_data, email.get('sender', ''))
+            for email, (email_type, key_info) in zip(emails, analyses)
+        ]
+    
+    def _generate_responses_parallel(self, emails, user_data, workers):
+        """
+        Generate response suggestions for a batch of emails in worker processes.
         
+        Args:
+            emails (list): List of email data dictionaries
+            user_data (dict): User preferences and history data, or None
+            workers (int): Number of worker processes
+            
+        Returns:
+            list: Response suggestions for each email, in order
+        """
+        # A few chunks per worker evens out uneven chunks, while each chunk
+        # is still large enough to be scored in one scan by its worker
+        chunk_size = max(1, len(emails) // (4 * workers))
+        chunks = [emails[start:start + chunk_size] for start in range(0, len(emails), chunk_size)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_responses = executor.map(self.generate_responses, chunks, [user_data] * len(chunks))
+            return [response for responses in chunk_responses for response in responses]
+    
+    def __getstate__(self):
+        """
+        Get the state to pickle, e.g. when sending the generator to workers.
+        
+        Returns:
+            dict: Instance state without the analysis cache
+        """
+        state = self.__dict__.copy()
+        state['_analysis_cache'] = OrderedDict()
+        state['_analysis_cache_day'] = None
+        return state
+    
+    def _build_response(self, email_type, key_info, user_data, sender):
+        """
+        Build response suggestions from an email's analysis.
+        
+        Args:
+            email_type (str): Email type
+            key_info (dict): Key information extracted from the email
+            user_data (dict): User preferences and history data, or None
+            sender (str): Email sender
+            
+        Returns:
+            dict: Response suggestions including templates and quick replies
+        """
         # Generate template-based responses
         template_responses = self._generate_template_responses(email_type, key_info, user_data)
         
@@ -196,65 +378,272 @@ class SmartResponseGenerator:
             'key_info': key_info
         }
     
-    def _determine_email_type(self, subject, body):
+    def _analyze_emails(self, scan_items):
         """
-        Determine the type of email based on content analysis.
+        Determine the email type and key information of each email, reusing
+        the result for emails already analyzed today.
+        
+        Args:
+            scan_items (list): (subject, scanned body) tuples, with the body
+                from _get_scan_body
+            
+        Returns:
+            list: (email type, key information dictionary) tuple per email
+        """
+        today = date.today()
+        if today != self._analysis_cache_day:
+            self._analysis_cache.clear()
+            self._analysis_cache_day = today
+        
+        analyses = [None] * len(scan_items)
+        pending = []
+        for index, cache_key in enumerate(scan_items):
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(cache_key)
+                email_type, key_info = cached
+                analyses[index] = (email_type, dict(key_info))
+            else:
+                pending.append(index)
+        
+        if not pending:
+            return analyses
+        
+        # Lowercase subject and body once each for all analysis. The type scan
+        # joins them with a newline as before, but the date, time, deadline and
+        # task extractors search each part on its own, so a phrase split across
+        # the subject and body (e.g. 'due' / 'date') no longer matches there
+        parts_lc = [
+            (scan_items[index][0].lower(), scan_items[index][1].lower())
+            for index in pending
+        ]
+        email_types = self._determine_email_types(parts_lc)
+        
+        for index, (subject_lc, body_lc), email_type in zip(pending, parts_lc, email_types):
+            subject, scan_body = scan_items[index]
+            key_info = self._extract_key_info(subject, scan_body, subject_lc, body_lc, email_type)
+            
+            # Store a copy so callers can modify the returned key info
+            self._analysis_cache[scan_items[index]] = (email_type, dict(key_info))
+            if len(self._analysis_cache) > self.analysis_cache_size:
+                self._analysis_cache.popitem(last=False)
+            
+            analyses[index] = (email_type, key_info)
+        
+        return analyses
+    
+    def _get_scan_body(self, body):
+        """
+        Get the part of the body worth scanning for type and key information.
         
         Args:
-            subject (str): Email subject
             body (str): Email body
             
+        Returns:
+            str: Body up to the first quoted reply, capped at max_scan_length
+        """
+        reply_start = self._reply_cut_re.search(body)
+        if reply_start:
+            body = body[:reply_start.start()]
+        
+        return body[:self.max_scan_length]
+    
+    def _determine_email_type(self, text_lc):
+        """
+        Determine the type of email based on content analysis.
+        
+        Args:
+            text_lc (str): Lowercased email subject and body
+            
         Returns:
             str: Email type
         """
-        # Combine subject and body for analysis
-        text = f"{subject} {body}".lower()
+        return self._determine_email_types([(text_lc,)])[0]
+    
+    def _determine_email_types(self, parts_lc):
+        """
+        Determine the type of each email in a batch based on content analysis.
         
-        # Check for each email type pattern
-        type_scores = {}
-        for email_type, patterns in self.email_type_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = re.findall(r'\b' + pattern + r'\b', text)
-                score += len(matches)
-            type_scores[email_type] = score
+        Args:
+            parts_lc (list): Tuple of lowercased text parts (such as subject
+                and body) of each email
+            
+        Returns:
+            list: Email type of each email, in order
+        """
+        # Scan all parts at once, joined by newlines that no type keyword
+        # spans, and map each match back to its email by start offset
+        joined = '\n'.join([part for email_parts in parts_lc for part in email_parts])
+        text_starts = []
+        offset = 0
+        for email_parts in parts_lc:
+            text_starts.append(offset)
+            offset += sum(len(part) + 1 for part in email_parts)
+        
+        # Count matches per email type
+        type_range = range(len(self._type_names))
+        all_scores = [[0] * len(self._type_names) for _ in parts_lc]
+        if self._type_automaton is not None:
+            for end, (type_index, length) in self._type_automaton.iter(joined):
+                start = end - length + 1
+                if self._is_whole_word(joined, start, end + 1):
+                    all_scores[bisect_right(text_starts, start) - 1][type_index] += 1
+        else:
+            # Scan as bytes when possible; offsets are the same for ASCII text
+            joined_scan = joined.encode('ascii') if joined.isascii() else joined
+            for type_index, type_union in enumerate(self._type_unions):
+                for match in self._pattern_for(type_union, joined_scan).finditer(joined_scan):
+                    all_scores[bisect_right(text_starts, match.start()) - 1][type_index] += 1
+        
+        email_types = []
+        for type_scores in all_scores:
+            # Get the email type with the highest score
+            best = max(type_range, key=type_scores.__getitem__)
+            if type_scores[best] > 0:
+                email_types.append(self._type_names[best])
+            else:
+                # Default to general if no specific type is detected
+                email_types.append('general')
+        
+        return email_types
+    
+    def _is_whole_word(self, text, start, end):
+        """
+        Check whether text[start:end] is bounded by non-word characters.
         
-        # Get the email type with the highest score
-        if max(type_scores.values()) > 0:
-            return max(type_scores.items(), key=lambda x: x[1])[0]
+        Args:
+            text (str): Text containing the match
+            start (int): Start index of the match
+            end (int): End index of the match (exclusive)
+            
+        Returns:
+            bool: True if the match starts and ends on word boundaries
+        """
+        if start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+            return False
+        if end < len(text) and (text[end].isalnum() or text[end] == '_'):
+            return False
         
-        # Default to general if no specific type is detected
-        return 'general'
+        return True
     
-    def _extract_key_info(self, subject, body, email_type):
+    def _extract_key_info(self, subject, body, subject_lc, body_lc, email_type):
         """
         Extract key information from the email based on its type.
         
         Args:
             subject (str): Email subject
             body (str): Email body
+            subject_lc (str): Lowercased subject
+            body_lc (str): Lowercased body
             email_type (str): Type of email
             
         Returns:
             dict: Extracted key information
         """
-        # Combine subject and body for analysis
-        text = f"{subject}\n{body}"
+        # Only run the extractors whose fields the email type's templates use
+        fields = self._fields_by_type.get(email_type, ())
+        
+        # Find dates, times and deadlines in one pass; deadlines fall back to dates
+        scan_kinds = tuple(kind for kind in ('date', 'time', 'deadline') if kind in fields)
+        if 'deadline' in scan_kinds and 'date' not in scan_kinds:
+            scan_kinds = ('date',) + scan_kinds
+        
+        # The subject is searched before the body; matches never span the two
+        sources = ()
+        if scan_kinds or 'task' in fields:
+            sources = self._make_sources((subject, subject_lc), (body, body_lc))
+        first_matches = self._scan_first_matches(sources, scan_kinds) if scan_kinds else {}
+        
+        # The action and issue extractors take the whole text
+        text = f"{subject}\n{body}" if 'action' in fields or 'issue' in fields else ''
         
         # Initialize key info dictionary
         key_info = {
             'topic': self._extract_topic(subject, body),
-            'date': self._extract_date(text),
-            'time': self._extract_time(text),
-            'deadline': self._extract_deadline(text),
-            'task': self._extract_task(text) if email_type == 'task_assignment' else '',
-            'action': self._extract_action(text) if email_type == 'thank_you' else '',
-            'issue': self._extract_issue(text) if email_type == 'apology' else '',
+            'date': self._extract_date(sources, first_matches) if 'date' in fields else '',
+            'time': self._extract_time(sources, first_matches) if 'time' in fields else '',
+            'deadline': self._extract_deadline(sources, first_matches) if 'deadline' in fields else '',
+            'task': self._extract_task(sources) if 'task' in fields else '',
+            'action': self._extract_action(text) if 'action' in fields else '',
+            'issue': self._extract_issue(text) if 'issue' in fields else '',
             'info': ''  # Placeholder for information requests
         }
         
         return key_info
     
+    def _make_sources(self, *parts):
+        """
+        Prepare text parts for the extractors.
+        
+        Args:
+            *parts (tuple): (text, lowercased text) pairs, in search order
+            
+        Returns:
+            tuple: (text, scan text) pairs, the scan text being bytes for
+                ASCII-only parts scanned with re and the lowercased str otherwise
+        """
+        # With stdlib re, ASCII-only text is scanned as bytes; extractors find
+        # the same spans in it. RE2 matches UTF-8 internally, so it gains nothing
+        # from bytes and would report group names as bytes
+        if _pattern_engine is not re:
+            return tuple(parts)
+        
+        return tuple(
+            (text, text_lc.encode('ascii') if text_lc.isascii() else text_lc)
+            for text, text_lc in parts
+        )
+    
+    def _scan_first_matches(self, sources, kinds):
+        """
+        Find the first date, time and/or deadline match in a single scan.
+        
+        Args:
+            sources (tuple): (text, scan text) pairs from _make_sources
+            kinds (tuple): Kinds to look for, from 'date', 'time' and 'deadline'
+            
+        Returns:
+            dict: (text, scan text, match object) of the first match of each kind found
+        """
+        scanner = self._datetime_scanners.get(kinds)
+        if scanner is None:
+            scanner = _pattern_engine.compile('|'.join(
+                r'(?P<' + kind + r'>' + self._datetime_sources[kind].pattern + r')' for kind in kinds
+            ))
+            self._datetime_scanners[kinds] = scanner
+        
+        first_matches = {}
+        for text, text_lc in sources:
+            for match in self._pattern_for(scanner, text_lc).finditer(text_lc):
+                if match.lastgroup not in first_matches:
+                    first_matches[match.lastgroup] = (text, text_lc, match)
+                    if len(first_matches) == len(kinds):
+                        return first_matches
+        
+        return first_matches
+    
+    def _pattern_for(self, pattern, text_lc):
+        """
+        Get the version of a compiled pattern that can scan the given text.
+        
+        Only stdlib re patterns are ever given bytes text; see _make_sources.
+        
+        Args:
+            pattern (re.Pattern): Compiled str pattern
+            text_lc (str or bytes): Text to be scanned
+            
+        Returns:
+            re.Pattern: The pattern itself, or its bytes version for bytes text
+        """
+        if not isinstance(text_lc, bytes):
+            return pattern
+        
+        bytes_pattern = self._bytes_patterns.get(pattern)
+        if bytes_pattern is None:
+            bytes_pattern = re.compile(pattern.pattern.encode('ascii'), pattern.flags & ~re.UNICODE)
+            self._bytes_patterns[pattern] = bytes_pattern
+        
+        return bytes_pattern
+    
     def _extract_topic(self, subject, body):
         """
         Extract the main topic from the email.
@@ -269,133 +658,141 @@ class SmartResponseGenerator:
         # Use subject as the primary source for topic
         if subject:
             # Remove common prefixes like "Re:", "Fwd:", etc.
-            clean_subject = re.sub(r'^(Re|Fwd|FW|RE|FWD):\s*', '', subject)
+            clean_subject = self._subject_prefix_re.sub('', subject)
             return clean_subject
         
         # If subject is empty, try to extract from the first sentence of the body
         if body:
-            sentences = sent_tokenize(body)
-            if sentences:
-                return sentences[0][:50] + ('...' if len(sentences[0]) > 50 else '')
+            first_sentence = self._sent_split_re.split(body.strip(), 1)[0]
+            if first_sentence:
+                return first_sentence[:50] + ('...' if len(first_sentence) > 50 else '')
         
         return "this matter"  # Default fallback
     
-    def _extract_date(self, text):
+    def _matched_text(self, text, text_lc, match, group=0):
+        """
+        Get the original-case text of a match found in the lowercased text.
+        
+        Args:
+            text (str): Original text
+            text_lc (str or bytes): Lowercased text the match was found in
+            match (re.Match): Match object
+            group (int): Group to return
+            
+        Returns:
+            str: Matched text with its original casing
+        """
+        # Lowercasing can change the length of some non-ASCII text, in
+        # which case the spans no longer line up with the original
+        if len(text) != len(text_lc):
+            return match.group(group)
+        
+        return text[match.start(group):match.end(group)]
+    
+    def _extract_date(self, sources, first_matches=None):
         """
         Extract date information from text.
         
         Args:
-            text (str): Text to analyze
+            sources (tuple): (text, scan text) pairs from _make_sources
+            first_matches (dict, optional): Result of _scan_first_matches, if already computed
             
         Returns:
             str: Extracted date or placeholder
         """
-        # Common date patterns
-        date_patterns = [
-            # MM/DD/YYYY or DD/MM/YYYY
-            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
-            # Month DD, YYYY
-            r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{2,4}\b',
-            # DD Month YYYY
-            r'\b\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec),?\s+\d{2,4}\b',
-            # Next/This Monday, Tuesday, etc.
-            r'\b(?:next|this)\s+(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday|Mon|Tue|Wed|Thu|Fri|Sat|Sun)\b',
-            # Tomorrow, day after tomorrow
-            r'\b(?:tomorrow|day after tomorrow)\b'
-        ]
+        if first_matches is None:
+            first_matches = self._scan_first_matches(sources, ('date',))
         
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0)
+        # Common date patterns
+        found = first_matches.get('date')
+        if found:
+            return self._matched_text(*found)
         
         # Default to tomorrow if no date found
-        tomorrow = (datetime.now().date() + timedelta(days=1)).strftime("%A, %B %d")
-        return tomorrow
+        return self._tomorrow_text()
     
-    def _extract_time(self, text):
+    def _tomorrow_text(self):
+        """
+        Get tomorrow's date as display text, recomputed only when the day changes.
+        
+        Returns:
+            str: Tomorrow's date, e.g. "Friday, April 11"
+        """
+        today = date.today()
+        if self._tomorrow_cache[0] != today:
+            self._tomorrow_cache = (today, (today + timedelta(days=1)).strftime("%A, %B %d"))
+        
+        return self._tomorrow_cache[1]
+    
+    def _extract_time(self, sources, first_matches=None):
         """
         Extract time information from text.
         
         Args:
-            text (str): Text to analyze
+            sources (tuple): (text, scan text) pairs from _make_sources
+            first_matches (dict, optional): Result of _scan_first_matches, if already computed
             
         Returns:
             str: Extracted time or placeholder
         """
-        # Common time patterns
-        time_patterns = [
-            # HH:MM AM/PM
-            r'\b(?:0?[1-9]|1[0-2]):[0-5][0-9]\s*(?:am|pm|AM|PM)\b',
-            # Military time
-            r'\b(?:[01]?[0-9]|2[0-3]):[0-5][0-9]\b',
-            # X AM/PM
-            r'\b(?:0?[1-9]|1[0-2])\s*(?:am|pm|AM|PM)\b'
-        ]
+        if first_matches is None:
+            first_matches = self._scan_first_matches(sources, ('time',))
         
-        for pattern in time_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0)
+        # Common time patterns
+        found = first_matches.get('time')
+        if found:
+            return self._matched_text(*found)
         
         # Default to a business hour if no time found
         return "10:00 AM"
     
-    def _extract_deadline(self, text):
+    def _extract_deadline(self, sources, first_matches=None):
         """
         Extract deadline information from text.
         
         Args:
-            text (str): Text to analyze
+            sources (tuple): (text, scan text) pairs from _make_sources
+            first_matches (dict, optional): Result of _scan_first_matches, if already computed
             
         Returns:
             str: Extracted deadline or placeholder
         """
-        # Look for deadline indicators
-        deadline_indicators = [
-            r'due\s+by\s+(.*?)[\.;,]',
-            r'deadline\s+(?:is|of)\s+(.*?)[\.;,]',
-            r'complete\s+by\s+(.*?)[\.;,]',
-            r'finish\s+by\s+(.*?)[\.;,]',
-            r'submit\s+by\s+(.*?)[\.;,]'
-        ]
+        if first_matches is None:
+            first_matches = self._scan_first_matches(sources, ('date', 'deadline'))
         
-        for pattern in deadline_indicators:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        # Look for deadline indicators
+        found = first_matches.get('deadline')
+        if found:
+            # Re-match the deadline alone to get its capture group; each
+            # alternative has one, and lastindex is the one that matched
+            text, text_lc, match = found
+            match = self._pattern_for(self._deadline_re, text_lc).match(text_lc, match.start())
+            return self._matched_text(text, text_lc, match, match.lastindex).strip()
         
         # If no specific deadline found, extract any date as potential deadline
-        date = self._extract_date(text)
+        date = self._extract_date(sources, first_matches)
         if date:
             return date
         
         # Default to end of week if no deadline found
         return "the end of this week"
     
-    def _extract_task(self, text):
+    def _extract_task(self, sources):
         """
         Extract task information from text.
         
         Args:
-            text (str): Text to analyze
+            sources (tuple): (text, scan text) pairs from _make_sources
             
         Returns:
             str: Extracted task or placeholder
         """
         # Look for task assignment patterns
-        task_patterns = [
-            r'(?:please|kindly|could you|can you)\s+(.*?)[\.;,]',
-            r'(?:assigned|assigning|assign)\s+(?:you|to you)\s+(.*?)[\.;,]',
-            r'(?:task|responsibility)\s+(?:is|of)\s+(.*?)[\.;,]',
-            r'need\s+you\s+to\s+(.*?)[\.;,]',
-            r'would\s+like\s+you\s+to\s+(.*?)[\.;,]'
-        ]
-        
-        for pattern in task_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for text, text_lc in sources:
+            match = self._pattern_for(self._task_re, text_lc).search(text_lc)
             if match:
-                return match.group(1).strip()
+                # Each alternative has one capture group; lastindex is the one that matched
+                return self._matched_text(text, text_lc, match, match.lastindex).strip()
         
         # If no specific task found, use topic as fallback
         return "the requested task"
@@ -3,14 +3,9 @@ Test script for Email Management AI Agent.
 This script tests the functionality of the various components.
 """
 
-import os
-import sys
 import unittest
 from unittest.mock import MagicMock, patch
 
-# Add the src directory to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 # Import modules to test
 from src.email_retriever import EmailRetriever
 from src.email_categorizer import EmailCategorizer
@@ -21,9 +16,15 @@ from src.digest_generator import DigestGenerator
 class TestEmailRetriever(unittest.TestCase):
     """Test the EmailRetriever class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up the mock Gmail service shared by all tests."""
+        cls.mock_gmail_service = MagicMock()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.mock_gmail_service = MagicMock()
+        # Clear calls and configured responses left by the previous test
+        self.mock_gmail_service.reset_mock(return_value=True, side_effect=True)
         self.email_retriever = EmailRetriever(self.mock_gmail_service)
     
     def test_get_emails(self):
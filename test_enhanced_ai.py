@@ -3,15 +3,20 @@ Test script for enhanced AI features of the Email Management AI Agent.
 """
 
 import os
+import re
 import sys
-import json
+import copy
+import pickle
+import shutil
+import tempfile
 import unittest
+import importlib.util
+from collections import defaultdict
+from unittest.mock import patch
 from datetime import datetime, timedelta
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Import modules to test
+from src import smart_response as smart_response_module
 from src.smart_response import SmartResponseGenerator
 from src.workload_manager import WorkloadManager
 from src.sentiment_analyzer import SentimentAnalyzer
@@ -19,38 +24,236 @@ from src.contextual_learning import ContextualLearningSystem
 from src.advanced_nlp import AdvancedNLPUnderstanding
 from src.proactive_notifications import ProactiveNotificationSystem
 
+# Test email fixtures, built once at import. Each test gets its own deep
+# copy, so a component or test changing one cannot affect later tests. Their
+# strings are interned and shared by the copies, so component caches keyed
+# on the same subject or body compare them by identity
+_NOW = datetime.now()
+_YESTERDAY = _NOW - timedelta(days=1)
+_LAST_WEEK = _NOW - timedelta(days=7)
+
+_TEST_EMAILS = tuple({
+    key: sys.intern(value) if isinstance(value, str) else value
+    for key, value in email.items()
+} for email in [
+    {
+        'id': 'email1',
+        'sender': 'boss@example.com',
+        'recipient': 'user@example.com',
+        'subject': 'Urgent: Project Deadline',
+        'body': """
+        Hi Team,
+        
+        I need the project report by tomorrow. This is very urgent as the client is waiting for it.
+        
+        Please make sure to include:
+        1. Executive summary
+        2. Key findings
+        3. Recommendations
+        
+        Let me know if you have any questions.
+        
+        Thanks,
+        Boss
+        """,
+        'date': _NOW.isoformat(),
+        'read': False,
+        'category': 'inbox',
+        'priority': 'high',
+        'attachments': []
+    },
+    {
+        'id': 'email2',
+        'sender': 'colleague@example.com',
+        'recipient': 'user@example.com',
+        'subject': 'Meeting Notes from Yesterday',
+        'body': """
+        Hi,
+        
+        Attached are the notes from yesterday's meeting. We discussed the following:
+        
+        - Project timeline updates
+        - Budget allocation
+        - Resource planning
+        
+        Please review and let me know if I missed anything.
+        
+        Best,
+        Colleague
+        """,
+        'date': _YESTERDAY.isoformat(),
+        'read': True,
+        'category': 'inbox',
+        'priority': 'medium',
+        'attachments': [
+            {'name': 'meeting_notes.pdf', 'type': 'application/pdf'}
+        ]
+    },
+    {
+        'id': 'email3',
+        'sender': 'newsletter@example.com',
+        'recipient': 'user@example.com',
+        'subject': 'Weekly Industry Updates',
+        'body': """
+        Hello,
+        
+        Here are this week's industry updates:
+        
+        - New product launches
+        - Market trends
+        - Competitor analysis
+        
+        Click here to read more.
+        
+        Regards,
+        Newsletter Team
+        """,
+        'date': _LAST_WEEK.isoformat(),
+        'read': True,
+        'category': 'newsletters',
+        'priority': 'low',
+        'attachments': []
+    },
+    {
+        'id': 'email4',
+        'sender': 'client@example.com',
+        'recipient': 'user@example.com',
+        'subject': 'Feedback on Proposal',
+        'body': """
+        Hello,
+        
+        Thank you for sending the proposal. I've reviewed it and have some feedback:
+        
+        The pricing structure seems a bit high compared to other vendors. Could you provide a more competitive quote?
+        
+        I like the approach you've outlined, but I'm concerned about the timeline. Can we accelerate the delivery?
+        
+        Please let me know your thoughts.
+        
+        Best regards,
+        Client
+        """,
+        'date': _YESTERDAY.isoformat(),
+        'read': False,
+        'category': 'inbox',
+        'priority': 'high',
+        'attachments': []
+    },
+    {
+        'id': 'email5',
+        'sender': 'support@example.com',
+        'recipient': 'user@example.com',
+        'subject': 'Your Support Ticket #12345',
+        'body': """
+        Dear User,
+        
+        Your support ticket #12345 has been resolved. Here's a summary of the issue and resolution:
+        
+        Issue: Unable to access the system
+        Resolution: Reset user permissions and updated access controls
+        
+        If you continue to experience issues, please let us know.
+        
+        Thank you,
+        Support Team
+        """,
+        'date': _LAST_WEEK.isoformat(),
+        'read': True,
+        'category': 'support',
+        'priority': 'medium',
+        'attachments': []
+    }
+])
+
+# Test progress output is printed only when TEST_VERBOSE=1
+_VERBOSE = bool(int(os.environ.get('TEST_VERBOSE', '0')))
+_p = print if _VERBOSE else (lambda *args, **kwargs: None)
+
+# Keywords the tests look for in subjects and generated text, found in one scan
+_CHECK_KEYWORDS_RE = re.compile('urgent|meeting|feedback|regards|thanks|sincerely|3:00 pm|tomorrow')
+
+# Accepted response openings, and sign-off keywords from _CHECK_KEYWORDS_RE
+_GREETINGS = ('Hi', 'Hello', 'Dear')
+_SIGNOFFS = frozenset(('regards', 'thanks', 'sincerely'))
+
+def _keywords_in(text):
+    """
+    Find which check keywords occur in a text, ignoring case.
+    
+    Args:
+        text (str): Text to scan
+        
+    Returns:
+        set: Check keywords found in the text
+    """
+    return set(_CHECK_KEYWORDS_RE.findall(text.lower()))
+
 class TestEnhancedAIFeatures(unittest.TestCase):
     """Test case for enhanced AI features."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create test data directory
-        os.makedirs('/home/ubuntu/email_agent/data/test', exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        """Set up the AI components shared by all tests."""
+        # Create a throwaway test data directory, in RAM where available
+        cls.data_dir = tempfile.mkdtemp(
+            prefix='email_agent_test_',
+            dir='/dev/shm' if os.path.isdir('/dev/shm') else None
+        )
         
         # Initialize test user ID
-        self.user_id = 'test_user'
+        cls.user_id = 'test_user'
+        
+        # Initialize the components that load NLP resources once; their
+        # caches are keyed by email content and hand out copies
+        cls.smart_response = SmartResponseGenerator()
+        cls.sentiment_analyzer = SentimentAnalyzer()
+        cls.contextual_learning = ContextualLearningSystem(
+            user_id=cls.user_id,
+            data_dir=cls.data_dir
+        )
+        cls.advanced_nlp = AdvancedNLPUnderstanding()
         
+        # Snapshot the learning state, so each test starts from the same model
+        cls._learning_snapshot = pickle.dumps(
+            (cls.contextual_learning.user_model, cls.contextual_learning.behavior_tracking)
+        )
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the test data directory."""
+        shutil.rmtree(cls.data_dir, ignore_errors=True)
+    
+    def setUp(self):
+        """Set up test fixtures."""
         # Initialize test data
-        self.test_emails = self._create_test_emails()
+        self.test_emails = copy.deepcopy(_TEST_EMAILS)
+        
+        # Index the test emails by sender for per-sender analysis
+        self._by_sender = defaultdict(list)
+        for email in self.test_emails:
+            self._by_sender[email['sender']].append(email)
         
-        # Initialize components
-        self.smart_response = SmartResponseGenerator()
+        # Components holding per-run state are built fresh for each test
         self.workload_manager = WorkloadManager()
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.contextual_learning = ContextualLearningSystem(
-            user_id=self.user_id,
-            data_dir='/home/ubuntu/email_agent/data/test'
-        )
-        self.advanced_nlp = AdvancedNLPUnderstanding()
         self.proactive_notifications = ProactiveNotificationSystem(
             user_id=self.user_id,
-            data_dir='/home/ubuntu/email_agent/data/test'
+            data_dir=self.data_dir
         )
         
+        # Forget emails analyzed during earlier tests
+        self.advanced_nlp.context_window.clear()
+        
         # Register notification handler
         self.notifications_received = []
         self.proactive_notifications.register_notification_handler(self._notification_handler)
     
+    def tearDown(self):
+        """Roll back state changed by the test."""
+        # Restore the learning state snapshot taken in setUpClass
+        user_model, behavior_tracking = pickle.loads(self._learning_snapshot)
+        self.contextual_learning.user_model = user_model
+        self.contextual_learning.behavior_tracking = behavior_tracking
+    
     def _notification_handler(self, notification, method):
         """Handle notifications for testing."""
         self.notifications_received.append({
@@ -58,152 +261,17 @@ class TestEnhancedAIFeatures(unittest.TestCase):
             'method': method
         })
     
-    def _create_test_emails(self):
-        """Create test email data."""
-        now = datetime.now()
-        yesterday = now - timedelta(days=1)
-        last_week = now - timedelta(days=7)
-        
-        return [
-            {
-                'id': 'email1',
-                'sender': 'boss@example.com',
-                'recipient': 'user@example.com',
-                'subject': 'Urgent: Project Deadline',
-                'body': """
-                Hi Team,
-                
-                I need the project report by tomorrow. This is very urgent as the client is waiting for it.
-                
-                Please make sure to include:
-                1. Executive summary
-                2. Key findings
-                3. Recommendations
-                
-                Let me know if you have any questions.
-                
-                Thanks,
-                Boss
-                """,
-                'date': now.isoformat(),
-                'read': False,
-                'category': 'inbox',
-                'priority': 'high',
-                'attachments': []
-            },
-            {
-                'id': 'email2',
-                'sender': 'colleague@example.com',
-                'recipient': 'user@example.com',
-                'subject': 'Meeting Notes from Yesterday',
-                'body': """
-                Hi,
-                
-                Attached are the notes from yesterday's meeting. We discussed the following:
-                
-                - Project timeline updates
-                - Budget allocation
-                - Resource planning
-                
-                Please review and let me know if I missed anything.
-                
-                Best,
-                Colleague
-                """,
-                'date': yesterday.isoformat(),
-                'read': True,
-                'category': 'inbox',
-                'priority': 'medium',
-                'attachments': [
-                    {'name': 'meeting_notes.pdf', 'type': 'application/pdf'}
-                ]
-            },
-            {
-                'id': 'email3',
-                'sender': 'newsletter@example.com',
-                'recipient': 'user@example.com',
-                'subject': 'Weekly Industry Updates',
-                'body': """
-                Hello,
-                
-                Here are this week's industry updates:
-                
-                - New product launches
-                - Market trends
-                - Competitor analysis
-                
-                Click here to read more.
-                
-                Regards,
-                Newsletter Team
-                """,
-                'date': last_week.isoformat(),
-                'read': True,
-                'category': 'newsletters',
-                'priority': 'low',
-                'attachments': []
-            },
-            {
-                'id': 'email4',
-                'sender': 'client@example.com',
-                'recipient': 'user@example.com',
-                'subject': 'Feedback on Proposal',
-                'body': """
-                Hello,
-                
-                Thank you for sending the proposal. I've reviewed it and have some feedback:
-                
-                The pricing structure seems a bit high compared to other vendors. Could you provide a more competitive quote?
-                
-                I like the approach you've outlined, but I'm concerned about the timeline. Can we accelerate the delivery?
-                
-                Please let me know your thoughts.
-                
-                Best regards,
-                Client
-                """,
-                'date': yesterday.isoformat(),
-                'read': False,
-                'category': 'inbox',
-                'priority': 'high',
-                'attachments': []
-            },
-            {
-                'id': 'email5',
-                'sender': 'support@example.com',
-                'recipient': 'user@example.com',
-                'subject': 'Your Support Ticket #12345',
-                'body': """
-                Dear User,
-                
-                Your support ticket #12345 has been resolved. Here's a summary of the issue and resolution:
-                
-                Issue: Unable to access the system
-                Resolution: Reset user permissions and updated access controls
-                
-                If you continue to experience issues, please let us know.
-                
-                Thank you,
-                Support Team
-                """,
-                'date': last_week.isoformat(),
-                'read': True,
-                'category': 'support',
-                'priority': 'medium',
-                'attachments': []
-            }
-        ]
-    
     def test_smart_response_generation(self):
         """Test smart response generation."""
-        print("\n=== Testing Smart Response Generation ===")
+        _p("\n=== Testing Smart Response Generation ===")
         
-        # Test response generation for different email types
-        for email in self.test_emails:
-            response = self.smart_response.generate_response(email)
-            
-            print(f"Email: {email['subject']}")
-            print(f"Generated Response: {response['text'][:100]}...")
+        # Test response generation for different email types, as one batch
+        responses = self.smart_response.generate_responses(self.test_emails)
+        self.assertEqual(len(responses), len(self.test_emails))
+        
+        for email, response in zip(self.test_emails, responses):
+            _p(f"Email: {email['subject']}")
+            _p(f"Generated Response: {response['text'][:100]}...")
             
             # Assertions
             self.assertIsNotNone(response)
@@ -212,20 +280,18 @@ class TestEnhancedAIFeatures(unittest.TestCase):
             self.assertIn('suggestions', response)
             
             # Check response relevance
-            if 'urgent' in email['subject'].lower():
-                self.assertIn('urgent', response['text'].lower())
+            subject_keywords = _keywords_in(email['subject'])
+            response_keywords = _keywords_in(response['text'])
+            if 'urgent' in subject_keywords:
+                self.assertIn('urgent', response_keywords)
             
-            if 'meeting' in email['subject'].lower():
-                self.assertIn('meeting', response['text'].lower())
+            if 'meeting' in subject_keywords:
+                self.assertIn('meeting', response_keywords)
             
             # Check for greeting and signature
-            self.assertTrue(response['text'].startswith('Hi') or 
-                           response['text'].startswith('Hello') or 
-                           response['text'].startswith('Dear'))
+            self.assertTrue(response['text'].startswith(_GREETINGS))
             
-            self.assertTrue('regards' in response['text'].lower() or 
-                           'thanks' in response['text'].lower() or 
-                           'sincerely' in response['text'].lower())
+            self.assertTrue(response_keywords & _SIGNOFFS)
         
         # Test response customization
         custom_style = {
@@ -241,7 +307,7 @@ class TestEnhancedAIFeatures(unittest.TestCase):
             style=custom_style
         )
         
-        print(f"Custom Style Response: {response['text'][:100]}...")
+        _p(f"Custom Style Response: {response['text'][:100]}...")
         
         # Assertions for custom style
         self.assertIn(custom_style['signature'], response['text'])
@@ -252,27 +318,80 @@ class TestEnhancedAIFeatures(unittest.TestCase):
             {'meeting_time': '3:00 PM', 'meeting_date': 'tomorrow'}
         )
         
-        print(f"Template Response: {template_response['text'][:100]}...")
+        _p(f"Template Response: {template_response['text'][:100]}...")
         
         # Assertions for template
-        self.assertIn('meeting', template_response['text'].lower())
-        self.assertIn('3:00 pm', template_response['text'].lower())
-        self.assertIn('tomorrow', template_response['text'].lower())
+        template_keywords = _keywords_in(template_response['text'])
+        self.assertIn('meeting', template_keywords)
+        self.assertIn('3:00 pm', template_keywords)
+        self.assertIn('tomorrow', template_keywords)
+    
+    @unittest.skipUnless(importlib.util.find_spec('re2'), 'google-re2 is not installed')
+    def test_smart_response_with_re2(self):
+        """Test that the RE2 pattern engine gives the same responses as stdlib re."""
+        self.assertEqual(smart_response_module._pattern_engine.__name__, 're2')
+        
+        # Load a second copy of the module with re2 hidden, so it falls back
+        # to stdlib re and its bytes scanning path
+        spec = importlib.util.find_spec(smart_response_module.__name__)
+        with patch.dict(sys.modules, {'re2': None}):
+            stdlib_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(stdlib_module)
+        self.assertIs(stdlib_module._pattern_engine, re)
+        
+        # ASCII emails are the ones scanned as bytes with stdlib re, which
+        # must not be applied to RE2 patterns
+        ascii_emails = [email for email in self.test_emails if (email['subject'] + email['body']).isascii()]
+        self.assertTrue(ascii_emails)
+        
+        re2_generator = SmartResponseGenerator()
+        re_generator = stdlib_module.SmartResponseGenerator()
+        for email in ascii_emails:
+            response = re2_generator.generate_response(email)
+            for key in ('email_type', 'template_responses', 'quick_replies', 'key_info'):
+                self.assertIn(key, response)
+            
+            self.assertEqual(response, re_generator.generate_response(email))
+    
+    def test_email_type_overlapping_keywords(self):
+        """Test that both email type scans count keywords overlapping across types."""
+        # 'status update' and 'any updates' also contain information request
+        # keywords; every whole-word match counts towards its type's score
+        emails = [
+            {'subject': 'Status update reminder', 'body': 'Following up on the status update. Any updates on progress?'},
+            {'subject': 'Any updates?', 'body': 'Following up on the report: any updates? A quick status update would help.'},
+            {'subject': 'Re: Status update', 'body': 'Touch base on the status update and the report'}
+        ]
+        expected_types = ['follow_up', 'follow_up', 'information_request']
+        
+        # The keyword automaton is used when pyahocorasick is installed, and
+        # the per-type regular expressions otherwise
+        automaton_generator = SmartResponseGenerator()
+        regex_generator = SmartResponseGenerator()
+        regex_generator._type_automaton = None
+        
+        generators = [regex_generator]
+        if automaton_generator._type_automaton is not None:
+            generators.append(automaton_generator)
+        
+        for generator in generators:
+            email_types = [generator.generate_response(email)['email_type'] for email in emails]
+            self.assertEqual(email_types, expected_types)
     
     def test_workload_management(self):
         """Test workload management system."""
-        print("\n=== Testing Workload Management System ===")
+        _p("\n=== Testing Workload Management System ===")
         
-        # Extract tasks from emails
+        # Extract tasks from all emails in one batch
         tasks = []
-        for email in self.test_emails:
-            extracted_tasks = self.workload_manager.extract_tasks_from_email(email)
+        batch_tasks = self.workload_manager.extract_tasks_batch(self.test_emails)
+        for email, extracted_tasks in zip(self.test_emails, batch_tasks):
             tasks.extend(extracted_tasks)
             
-            print(f"Email: {email['subject']}")
-            print(f"Extracted Tasks: {len(extracted_tasks)}")
+            _p(f"Email: {email['subject']}")
+            _p(f"Extracted Tasks: {len(extracted_tasks)}")
             for task in extracted_tasks:
-                print(f"  - {task['description'][:50]}...")
+                _p(f"  - {task['description'][:50]}...")
         
         # Assertions
         self.assertTrue(len(tasks) > 0)
@@ -280,26 +399,29 @@ class TestEnhancedAIFeatures(unittest.TestCase):
         # Test task prioritization
         prioritized_tasks = self.workload_manager.prioritize_tasks(tasks)
         
-        print(f"Prioritized Tasks: {len(prioritized_tasks)}")
+        _p(f"Prioritized Tasks: {len(prioritized_tasks)}")
         for i, task in enumerate(prioritized_tasks[:3]):
-            print(f"  {i+1}. {task['description'][:50]}... (Priority: {task['priority']})")
+            _p(f"  {i+1}. {task['description'][:50]}... (Priority: {task['priority']})")
         
         # Assertions
         self.assertEqual(len(tasks), len(prioritized_tasks))
         
-        # Check if high priority email tasks are prioritized higher
-        high_priority_tasks = [t for t in prioritized_tasks if t.get('email_priority') == 'high']
-        if high_priority_tasks:
-            self.assertTrue(high_priority_tasks[0]['priority'] in ['critical', 'high'])
+        # Check if high priority email tasks are prioritized higher; only the
+        # first one matters, so stop at it
+        first_high_priority_task = next(
+            (t for t in prioritized_tasks if t.get('email_priority') == 'high'), None
+        )
+        if first_high_priority_task:
+            self.assertIn(first_high_priority_task['priority'], ['critical', 'high'])
         
         # Test workload metrics
         metrics = self.workload_manager.get_workload_metrics(tasks)
         
-        print(f"Workload Metrics:")
-        print(f"  Total Tasks: {metrics['total_tasks']}")
-        print(f"  High Priority: {metrics['priority_counts'].get('high', 0)}")
-        print(f"  Medium Priority: {metrics['priority_counts'].get('medium', 0)}")
-        print(f"  Low Priority: {metrics['priority_counts'].get('low', 0)}")
+        _p(f"Workload Metrics:")
+        _p(f"  Total Tasks: {metrics['total_tasks']}")
+        _p(f"  High Priority: {metrics['priority_counts'].get('high', 0)}")
+        _p(f"  Medium Priority: {metrics['priority_counts'].get('medium', 0)}")
+        _p(f"  Low Priority: {metrics['priority_counts'].get('low', 0)}")
         
         # Assertions
         self.assertEqual(metrics['total_tasks'], len(tasks))
@@ -309,26 +431,63 @@ class TestEnhancedAIFeatures(unittest.TestCase):
         # Test workload recommendations
         recommendations = self.workload_manager.get_workload_recommendations(tasks)
         
-        print(f"Workload Recommendations:")
+        _p(f"Workload Recommendations:")
         for rec in recommendations[:3]:
-            print(f"  - {rec[:100]}...")
+            _p(f"  - {rec[:100]}...")
         
         # Assertions
         self.assertTrue(len(recommendations) > 0)
+        
+        # Test task scheduling; extracting tasks does not queue them
+        self.assertIsNone(self.workload_manager.pop_next_task())
+        
+        def deadline(days):
+            return {'datetime': _NOW + timedelta(days=days)}
+        
+        scheduled_tasks = [
+            {'id': 'low_soon', 'priority': 'low', 'deadline': deadline(1)},
+            {'id': 'high_undated', 'priority': 'high', 'deadline': None},
+            {'id': 'high_later', 'priority': 'high', 'deadline': deadline(3)},
+            {'id': 'high_sooner', 'priority': 'high', 'deadline': deadline(2)},
+            {'id': 'medium_first', 'priority': 'medium', 'deadline': deadline(2)},
+            {'id': 'medium_second', 'priority': 'medium', 'deadline': deadline(2)}
+        ]
+        self.workload_manager.schedule_tasks(scheduled_tasks)
+        
+        # Scheduling a task that is already queued is a no-op
+        self.assertFalse(self.workload_manager.schedule_task(scheduled_tasks[0]))
+        
+        # Tasks come out by priority, then deadline with undated tasks last,
+        # then scheduling order
+        popped_ids = []
+        task = self.workload_manager.pop_next_task()
+        while task is not None:
+            popped_ids.append(task['id'])
+            task = self.workload_manager.pop_next_task()
+        
+        self.assertEqual(popped_ids, [
+            'high_sooner', 'high_later', 'high_undated',
+            'medium_first', 'medium_second', 'low_soon'
+        ])
+        
+        # A popped task's id is released, so it can be scheduled again
+        self.assertTrue(self.workload_manager.schedule_task(scheduled_tasks[0]))
+        self.assertEqual(self.workload_manager.pop_next_task()['id'], 'low_soon')
     
     def test_sentiment_analysis(self):
         """Test sentiment analysis capabilities."""
-        print("\n=== Testing Sentiment Analysis ===")
+        _p("\n=== Testing Sentiment Analysis ===")
         
-        # Analyze sentiment for each email
-        for email in self.test_emails:
-            sentiment = self.sentiment_analyzer.analyze_sentiment(email)
-            
-            print(f"Email: {email['subject']}")
-            print(f"  Primary Emotion: {sentiment['emotions']['primary']}")
-            print(f"  Urgency Level: {sentiment['urgency']['level']}")
-            print(f"  Overall Sentiment: {sentiment['overall_sentiment']}")
-            print(f"  Requires Attention: {sentiment['requires_attention']}")
+        # Analyze sentiment for all emails in one batch
+        sentiments = self.sentiment_analyzer.analyze_sentiments(self.test_emails)
+        self.assertEqual(len(sentiments), len(self.test_emails))
+        
+        for email, sentiment in zip(self.test_emails, sentiments):
+            _p(f"Email: {email['subject']}")
+            _p(f"  Primary Emotion: {sentiment['emotions']['primary']}")
+            _p(f"  Urgency Level: {sentiment['urgency']['level']}")
+            _p(f"  Overall Sentiment: {sentiment['overall_sentiment']}")
+            _p(f"  Requires Attention: {sentiment['requires_attention']}")
         
             # Assertions
             self.assertIn('emotions', sentiment)
@@ -338,22 +497,21 @@ class TestEnhancedAIFeatures(unittest.TestCase):
             self.assertIn('requires_attention', sentiment)
             
             # Check specific emails
-            if 'urgent' in email['subject'].lower():
+            subject_keywords = _keywords_in(email['subject'])
+            if 'urgent' in subject_keywords:
                 self.assertIn(sentiment['urgency']['level'], ['critical', 'high'])
                 self.assertTrue(sentiment['requires_attention'])
             
-            if 'feedback' in email['subject'].lower():
+            if 'feedback' in subject_keywords:
                 self.assertIn(sentiment['emotions']['primary'], ['concern', 'frustration'])
         
         # Test relationship analysis
-        relationship = self.sentiment_analyzer.analyze_relationship(
-            [e for e in self.test_emails if e['sender'] == 'boss@example.com']
-        )
+        relationship = self.sentiment_analyzer.analyze_relationship(self._by_sender['boss@example.com'])
         
-        print(f"Relationship Analysis for boss@example.com:")
-        print(f"  Status: {relationship['status']}")
-        print(f"  Common Topics: {relationship['common_topics']}")
-        print(f"  Suggestions: {relationship['maintenance_suggestions'][:1]}")
+        _p(f"Relationship Analysis for boss@example.com:")
+        _p(f"  Status: {relationship['status']}")
+        _p(f"  Common Topics: {relationship['common_topics']}")
+        _p(f"  Suggestions: {relationship['maintenance_suggestions'][:1]}")
         
         # Assertions
         self.assertIn('status', relationship)
@@ -364,10 +522,10 @@ class TestEnhancedAIFeatures(unittest.TestCase):
         # Test sentiment summary
         summary = self.sentiment_analyzer.get_sentiment_summary(self.test_emails)
         
-        print(f"Sentiment Summary:")
-        print(f"  Total Emails: {summary['total_emails']}")
-        print(f"  Sentiment Percentages: {summary['sentiment_percentages']}")
-        print(f"  Dominant Emotions: {summary['dominant_emotions']}")
+        _p(f"Sentiment Summary:")
+        _p(f"  Total Emails: {summary['total_emails']}")
+        _p(f"  Sentiment Percentages: {summary['sentiment_percentages']}")
+        _p(f"  Dominant Emotions: {summary['dominant_emotions']}")
         
         # Assertions
         self.assertEqual(summary['total_emails'], len(self.test_emails))
@@ -376,7 +534,7 @@ class TestEnhancedAIFeatures(unittest.TestCase):
     
     def test_contextual_learning(self):
         """Test contextual learning features."""
-        print("\n=== Testing Contextual Learning ===")
+        _p("\n=== Testing Contextual Learning ===")
         
         # Track email interactions
         for i, email in enumerate(self.test_emails):
@@ -396,15 +554,15 @@ class TestEnhancedAIFeatures(unittest.TestCase):
                 metadata
             )
             
-            print(f"Tracked {action} interaction for: {email['subject']}")
+            _p(f"Tracked {action} interaction for: {email['subject']}")
         
         # Analyze behavior patterns
         insights = self.contextual_learning.analyze_behavior_patterns()
         
-        print(f"Behavior Insights:")
+        _p(f"Behavior Insights:")
         if insights['status'] == 'success':
             if 'time_insights' in insights:
-                print(f"  Time Insights: {insights['time_insights']}")
+                _p(f"  Time Insights: {insights['time_insights']}")
             if 'response_insights' in insights:
-                print(f"  Response Insights: {insights['response_ins
+                _p(f"  Response Insights: {insights['response_ins
 (Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
@@ -4,11 +4,114 @@ Helps users prioritize tasks and manage their workload effectively.
 """
 
 import re
+import sys
 import datetime
-from dateutil import parser
-from dateutil.relativedelta import relativedelta
 import heapq
+import itertools
+from bisect import bisect_right
 from collections import defaultdict
+from functools import lru_cache
+
+# Optional Hyperscan database for prefiltering the task and deadline patterns
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional Aho-Corasick automaton for urgency indicator matching
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Compiled Hyperscan databases shared by all instances, keyed by pattern source;
+# bounded repeats make compiling them comparatively slow
+_PATTERN_DBS = {}
+
+# Text the multi-pattern database scans exactly like re: ASCII without the
+# \x1c-\x1f separators, which re treats as whitespace but Hyperscan does not
+_HYPERSCAN_UNSAFE_RE = re.compile(r'[^\x00-\x1b\x20-\x7f]')
+
+# Separator for joining emails in batch extraction. Only \s can consume its
+# newlines and only '.' or a capture class its NUL, and the patterns require
+# ':' or a terminator after those, so no match can span two emails
+_BATCH_SEPARATOR = '\n\x00\n'
+
+# Lowercase keywords of which every task pattern needs at least one
+_TASK_TRIGGERS = (
+    'please', 'kindly', 'could you', 'can you', 'need', 'want', 'require',
+    'would', 'should', 'assign', 'task', 'assignment', 'responsibility',
+    'action', 'follow', 'due', 'complete', 'finish', 'submit', 'deliver',
+    'waiting', 'depend', 'expect'
+)
+
+# Characters re.IGNORECASE matches against trigger letters that str.lower()
+# does not map to them
+_CASE_FOLD_ODDITIES_RE = re.compile('[\u0130\u0131\u017f]')
+
+# Relative deadline expressions understood by _parse_deadline, in one scan;
+# the last named group of a match identifies the expression
+_DEADLINE_KEYWORD_RE = re.compile(
+    r'\b(?:(?P<today>today)|(?P<tomorrow>tomorrow)|(?P<this_week>this\s+week)|(?P<next_week>next\s+week)'
+    r'|(?P<this_month>this\s+month)|within\s+(?P<amount>\d+)\s+(?P<within>day|days|week|weeks|month|months)'
+    r'|next\s+(?P<weekday>Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday))\b',
+    re.IGNORECASE
+)
+
+# Deadline time used when the text gives none: 5:00 PM
+_DEFAULT_DEADLINE_TIME = datetime.time(17, 0)
+
+# Weekday numbers as returned by date.weekday()
+_WEEKDAY_NUMBERS = {'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4, 'saturday': 5, 'sunday': 6}
+
+# Precedence of the relative deadline expressions when several occur
+_DEADLINE_KEYWORD_PRECEDENCE = {
+    'today': 0,
+    'tomorrow': 1,
+    'this_week': 2,
+    'next_week': 3,
+    'this_month': 4,
+    'within': 5,
+    'weekday': 6
+}
+
+# dateutil is imported on first use, as many runs never parse a deadline
+_dateutil_parser = None
+_relativedelta = None
+
+def _get_dateutil():
+    """
+    Import dateutil's parser and relativedelta on first use.
+    
+    Returns:
+        tuple: (dateutil.parser module, relativedelta class)
+    """
+    global _dateutil_parser, _relativedelta
+    if _dateutil_parser is None:
+        from dateutil import parser
+        from dateutil.relativedelta import relativedelta
+        _dateutil_parser, _relativedelta = parser, relativedelta
+    
+    return _dateutil_parser, _relativedelta
+
+@lru_cache(maxsize=4096)
+def _fuzzy_parse(text, today):
+    """
+    Fuzzy-parse a date, caching results since deadline phrases repeat across emails.
+    
+    Args:
+        text (str): Date text
+        today (datetime.date): Date supplying missing fields; part of the cache key
+            so results do not go stale across midnight
+        
+    Returns:
+        datetime.datetime: Parsed date, or None if the text cannot be parsed
+    """
+    parser, _ = _get_dateutil()
+    try:
+        return parser.parse(text, fuzzy=True, default=datetime.datetime.combine(today, datetime.time()))
+    except (ValueError, OverflowError):
+        return None
 
 class WorkloadManager:
     """
@@ -31,35 +134,35 @@ class WorkloadManager:
         # Sender importance levels (to be populated from user data)
         self.sender_importance = {}
         
-        # Task extraction patterns
-        self.task_patterns = [
+        # Task extraction patterns, compiled once
+        self.task_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in [
             # Direct requests
-            r'(?:please|kindly|could you|can you)\s+(.*?)[\.;,]',
-            r'(?:need|want|require)\s+you\s+to\s+(.*?)[\.;,]',
-            r'(?:would|should)\s+(?:like|appreciate)\s+(?:it\s+)?if\s+you\s+(?:could|would)\s+(.*?)[\.;,]',
+            r'(?:please|kindly|could you|can you)\s+([^.;,\n]{0,400})[\.;,]',
+            r'(?:need|want|require)\s+you\s+to\s+([^.;,\n]{0,400})[\.;,]',
+            r'(?:would|should)\s+(?:like|appreciate)\s+(?:it\s+)?if\s+you\s+(?:could|would)\s+([^.;,\n]{0,400})[\.;,]',
             
             # Assignments
-            r'(?:assign|assigning|assigned)\s+(?:to\s+)?you\s+(.*?)[\.;,]',
-            r'your\s+(?:task|assignment|responsibility)\s+is\s+to\s+(.*?)[\.;,]',
+            r'(?:assign|assigning|assigned)\s+(?:to\s+)?you\s+([^.;,\n]{0,400})[\.;,]',
+            r'your\s+(?:task|assignment|responsibility)\s+is\s+to\s+([^.;,\n]{0,400})[\.;,]',
             
             # Action items
-            r'action\s+item(?:s)?(?:\s+for\s+you)?:\s+(.*?)[\.;,]',
-            r'follow(?:\s+|\-)up(?:\s+item)?(?:s)?:\s+(.*?)[\.;,]',
+            r'action\s+item(?:s)?(?:\s+for\s+you)?:\s+([^.;,\n]{0,400})[\.;,]',
+            r'follow(?:\s+|\-)up(?:\s+item)?(?:s)?:\s+([^.;,\n]{0,400})[\.;,]',
             
             # Deadlines with tasks
-            r'(?:due|complete|finish|submit|deliver)\s+by\s+.*?:\s+(.*?)[\.;,]',
+            r'(?:due|complete|finish|submit|deliver)\s+by\s+.{0,400}?:\s+([^.;,\n]{0,400})[\.;,]',
             
             # Implicit tasks
-            r'(?:waiting|depend)(?:ing)?\s+on\s+you\s+(?:to|for)\s+(.*?)[\.;,]',
-            r'(?:expecting|expect)\s+you\s+to\s+(.*?)[\.;,]'
-        ]
+            r'(?:waiting|depend)(?:ing)?\s+on\s+you\s+(?:to|for)\s+([^.;,\n]{0,400})[\.;,]',
+            r'(?:expecting|expect)\s+you\s+to\s+([^.;,\n]{0,400})[\.;,]'
+        ]]
         
-        # Deadline extraction patterns
-        self.deadline_patterns = [
+        # Deadline extraction patterns, compiled once
+        self.deadline_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in [
             # Explicit deadlines
-            r'(?:due|deadline|complete|finish|submit|deliver)\s+by\s+(.*?)[\.;,]',
-            r'(?:due|deadline|completion)\s+date(?:\s+is)?:\s+(.*?)[\.;,]',
-            r'(?:needed|required)\s+by\s+(.*?)[\.;,]',
+            r'(?:due|deadline|complete|finish|submit|deliver)\s+by\s+([^.;,\n]{0,400})[\.;,]',
+            r'(?:due|deadline|completion)\s+date(?:\s+is)?:\s+([^.;,\n]{0,400})[\.;,]',
+            r'(?:needed|required)\s+by\s+([^.;,\n]{0,400})[\.;,]',
             
             # Timeframe deadlines
             r'within\s+(\d+)\s+(?:day|days|week|weeks|month|months)',
@@ -73,7 +176,7 @@ class WorkloadManager:
             # Relative dates
             r'by\s+(tomorrow|next\s+(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday))',
             r'by\s+(this|next)\s+(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)'
-        ]
+        ]]
         
         # Urgency indicators
         self.urgency_indicators = {
@@ -95,12 +198,43 @@ class WorkloadManager:
             ]
         }
         
+        # The indicators are plain phrases, so when pyahocorasick is installed
+        # all of them are found in one pass; values are (priority rank, length)
+        self._urgency_automaton = None
+        if ahocorasick is not None:
+            self._urgency_automaton = ahocorasick.Automaton()
+            for rank, indicators in enumerate(self.urgency_indicators.values()):
+                for indicator in indicators:
+                    # Keep the higher priority for an indicator listed twice
+                    word = indicator.lower()
+                    if word not in self._urgency_automaton:
+                        self._urgency_automaton.add_word(word, (rank, len(word)))
+            self._urgency_automaton.make_automaton()
+        
+        # Optional multi-pattern database telling in one pass which task and
+        # deadline patterns can match an email at all; compiled on first use
+        self._pattern_db = None
+        self._pattern_db_built = False
+        
+        # One whole-word alternation per priority, so each level is a single scan
+        self._urgency_patterns = [
+            (priority, re.compile(r'\b(?:' + '|'.join(map(re.escape, indicators)) + r')\b', re.IGNORECASE))
+            for priority, indicators in self.urgency_indicators.items()
+        ]
+        
         # Project keywords (to be populated from user data)
         self.project_keywords = {}
         
         # Task status tracking
         self.tasks = {}
         
+        # Scheduling queue of (priority rank, deadline, arrival order, task) entries;
+        # the arrival counter breaks ties so tasks themselves are never compared.
+        # Queued task IDs keep a task from being scheduled twice
+        self._task_heap = []
+        self._task_sequence = itertools.count()
+        self._scheduled_task_ids = set()
+        
         # Workload metrics
         self.daily_capacity = 8  # Default: 8 hours per day
         self.task_time_estimates = {
@@ -121,45 +255,117 @@ class WorkloadManager:
         Returns:
             list: List of extracted tasks
         """
-        # Get email content
+        # Combine subject and body for analysis, lowercasing once for keyword checks
+        text = f"{email.get('subject', '')}\n{email.get('body', '')}"
+        text_lower = text.lower()
+        
+        # Skip the task patterns outright when none of their keywords occur,
+        # and otherwise those that cannot match anywhere in the email
+        if self._may_contain_task(text, text_lower):
+            task_patterns, deadline_patterns = self._candidate_patterns(text)
+        else:
+            task_patterns, deadline_patterns = (), None
+        
+        matches = (match for pattern in task_patterns for match in pattern.finditer(text))
+        return self._build_tasks(email, text, matches, deadline_patterns)
+    
+    def extract_tasks_batch(self, emails):
+        """
+        Extract tasks from several emails, running each task pattern once over all of them.
+        
+        Args:
+            emails (list): List of email data
+            
+        Returns:
+            list: Lists of extracted tasks, one per email in input order
+        """
+        texts = [f"{email.get('subject', '')}\n{email.get('body', '')}" for email in emails]
+        texts_lower = [text.lower() for text in texts]
+        
+        # Join the emails that may contain tasks, remembering where each one starts
+        candidates = [i for i, text in enumerate(texts) if self._may_contain_task(text, texts_lower[i])]
+        starts = []
+        position = 0
+        for i in candidates:
+            starts.append(position)
+            position += len(texts[i]) + len(_BATCH_SEPARATOR)
+        
+        combined = _BATCH_SEPARATOR.join(texts[i] for i in candidates)
+        task_patterns, deadline_patterns = self._candidate_patterns(combined)
+        
+        # Attribute each match to the email it starts in, keeping pattern order
+        matches = [[] for _ in emails]
+        for pattern in task_patterns:
+            for match in pattern.finditer(combined):
+                matches[candidates[bisect_right(starts, match.start()) - 1]].append(match)
+        
+        # Deadline patterns ruled out for the joined text cannot match any email in it
+        offsets = dict(zip(candidates, starts))
+        return [
+            self._build_tasks(
+                email, texts[i], matches[i],
+                deadline_patterns if i in offsets else None,
+                offsets.get(i, 0)
+            )
+            for i, email in enumerate(emails)
+        ]
+    
+    def _build_tasks(self, email, text, matches, deadline_patterns=None, offset=0):
+        """
+        Build task objects from task pattern matches in an email.
+        
+        Args:
+            email (dict): Email data
+            text (str): Combined subject and body text
+            matches (iterable): Task pattern matches, in pattern order
+            deadline_patterns (list): Deadline patterns to try (default: all)
+            offset (int): Position of text within the string the matches were made on
+            
+        Returns:
+            list: List of extracted tasks
+        """
+        # Get email content; the sender is interned so the many tasks from one
+        # sender share a single string and sender lookups compare by identity
         subject = email.get('subject', '')
-        body = email.get('body', '')
-        sender = email.get('sender', '')
+        sender = sys.intern(email.get('sender', ''))
         date = email.get('date', '')
         email_id = email.get('id', '')
         
-        # Combine subject and body for analysis
-        text = f"{subject}\n{body}"
+        # Resolve relative deadlines of all tasks against the same moment
+        now = datetime.datetime.now()
         
         # Extract tasks
         tasks = []
-        for pattern in self.task_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                task_description = match.group(1).strip()
-                if task_description:
-                    # Extract deadline for this specific task
-                    deadline = self._extract_deadline_for_task(text, task_description)
-                    
-                    # Determine priority
-                    priority = self._determine_task_priority(text, task_description, sender)
-                    
-                    # Create task object
-                    task = {
-                        'id': f"task_{email_id}_{len(tasks)}",
-                        'description': task_description,
-                        'source_email_id': email_id,
-                        'sender': sender,
-                        'date_received': date,
-                        'deadline': deadline,
-                        'priority': priority,
-                        'status': 'pending',
-                        'estimated_time': self.task_time_estimates.get(priority, 1.0),
-                        'project': self._determine_project(text, task_description),
-                        'dependencies': self._extract_dependencies(text, task_description)
-                    }
-                    
-                    tasks.append(task)
+        for match in matches:
+            raw_description = match.group(1)
+            task_description = raw_description.strip()
+            if task_description:
+                # The match gives the description's position, so its context is a slice
+                start = match.start(1) - offset + len(raw_description) - len(raw_description.lstrip())
+                task_context = self._get_context_around_span(text, start, start + len(task_description), 200)
+                
+                # Extract deadline for this specific task
+                deadline = self._extract_deadline_for_task(text, task_description, deadline_patterns, now, task_context)
+                
+                # Determine priority
+                priority = self._determine_task_priority(text, task_description, sender, task_context)
+                
+                # Create task object
+                task = {
+                    'id': f"task_{email_id}_{len(tasks)}",
+                    'description': task_description,
+                    'source_email_id': email_id,
+                    'sender': sender,
+                    'date_received': date,
+                    'deadline': deadline,
+                    'priority': priority,
+                    'status': 'pending',
+                    'estimated_time': self.task_time_estimates.get(priority, 1.0),
+                    'project': self._determine_project(text, task_description),
+                    'dependencies': self._extract_dependencies(text, task_description)
+                }
+                
+                tasks.append(task)
         
         # If no tasks found but email seems to contain a request, extract a generic task
         if not tasks and self._contains_request(text):
@@ -170,8 +376,10 @@ class WorkloadManager:
                 'source_email_id': email_id,
                 'sender': sender,
                 'date_received': date,
-                'deadline': self._extract_deadline(text),
-                'priority': self._determine_task_priority(text, subject, sender),
+                'deadline': self._extract_deadline(text, deadline_patterns),
+                'priority': self._determine_task_priority(
+                    text, subject, sender, self._get_context_around_span(text, 0, len(subject), 200)
+                ),
                 'status': 'pending',
                 'estimated_time': 0.5,  # Default: 30 minutes for email review
                 'project': self._determine_project(text, subject),
@@ -182,31 +390,158 @@ class WorkloadManager:
         
         return tasks
     
-    def _extract_deadline_for_task(self, text, task_description):
+    def schedule_tasks(self, tasks):
+        """
+        Add tasks to the scheduling queue.
+        
+        Args:
+            tasks (list): Tasks, e.g. from extract_tasks_from_email
+        """
+        for task in tasks:
+            self.schedule_task(task)
+    
+    def schedule_task(self, task):
+        """
+        Add a task to the scheduling queue, unless it is already queued.
+        
+        Args:
+            task (dict): Task data
+            
+        Returns:
+            bool: True if the task was queued
+        """
+        if task['id'] in self._scheduled_task_ids:
+            return False
+        self._scheduled_task_ids.add(task['id'])
+        
+        deadline = task.get('deadline')
+        deadline_datetime = deadline['datetime'] if isinstance(deadline, dict) else datetime.datetime.max
+        
+        heapq.heappush(self._task_heap, (
+            -self.priority_levels.get(task.get('priority'), 0),
+            deadline_datetime,
+            next(self._task_sequence),
+            task
+        ))
+        return True
+    
+    def pop_next_task(self):
+        """
+        Remove and return the most urgent queued task.
+        
+        Tasks are ordered by priority, then by earliest deadline, then by the
+        order in which they were scheduled.
+        
+        Returns:
+            dict: Next task, or None if the queue is empty
+        """
+        if not self._task_heap:
+            return None
+        
+        task = heapq.heappop(self._task_heap)[-1]
+        self._scheduled_task_ids.discard(task['id'])
+        return task
+    
+    def _may_contain_task(self, text, text_lower):
+        """
+        Cheaply check whether any task pattern could match the text.
+        
+        Args:
+            text (str): Email text
+            text_lower (str): Lowercased email text
+            
+        Returns:
+            bool: False only if no task pattern can match
+        """
+        if _CASE_FOLD_ODDITIES_RE.search(text):
+            return True
+        
+        return any(trigger in text_lower for trigger in _TASK_TRIGGERS)
+    
+    def _build_pattern_db(self):
+        """
+        Compile the task and deadline patterns into one Hyperscan database.
+        
+        Returns:
+            hyperscan.Database: Compiled database, or None if Hyperscan is unavailable
+        """
+        if hyperscan is None:
+            return None
+        
+        expressions = tuple(pattern.pattern.encode('ascii') for pattern in self.task_patterns + self.deadline_patterns)
+        db = _PATTERN_DBS.get(expressions)
+        if db is None:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=list(expressions),
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+            )
+            _PATTERN_DBS[expressions] = db
+        
+        return db
+    
+    def _candidate_patterns(self, text):
+        """
+        Narrow the task and deadline patterns to those matching somewhere in the text.
+        
+        A deadline pattern that does not match the whole text cannot match any
+        part of it either, so the result also serves for context searches.
+        
+        Args:
+            text (str): Email text
+            
+        Returns:
+            tuple: (task patterns, deadline patterns), in their original order
+        """
+        if not self._pattern_db_built:
+            self._pattern_db = self._build_pattern_db()
+            self._pattern_db_built = True
+        
+        if self._pattern_db is None or _HYPERSCAN_UNSAFE_RE.search(text):
+            return self.task_patterns, self.deadline_patterns
+        
+        matched = set()
+        self._pattern_db.scan(
+            text.encode('ascii'),
+            match_event_handler=lambda pattern_id, start, end, flags, context: matched.add(pattern_id)
+        )
+        
+        task_count = len(self.task_patterns)
+        task_patterns = [pattern for i, pattern in enumerate(self.task_patterns) if i in matched]
+        deadline_patterns = [pattern for i, pattern in enumerate(self.deadline_patterns, task_count) if i in matched]
+        return task_patterns, deadline_patterns
+    
+    def _extract_deadline_for_task(self, text, task_description, deadline_patterns=None, now=None, task_context=None):
         """
         Extract deadline specifically for a task.
         
         Args:
             text (str): Email text
             task_description (str): Task description
+            deadline_patterns (list): Deadline patterns to try (default: all)
+            now (datetime.datetime): Reference time for relative deadlines (default: current time)
+            task_context (str): Text around the task description, if already known
             
         Returns:
             dict: Deadline information
         """
         # First, look for deadlines in the vicinity of the task description
-        task_context = self._get_context_around_text(text, task_description, 200)
-        deadline_text = self._extract_deadline(task_context)
+        if task_context is None:
+            task_context = self._get_context_around_text(text, task_description, 200)
+        deadline_text = self._extract_deadline(task_context, deadline_patterns)
         
         # If no deadline found in context, check the entire text
         if not deadline_text:
-            deadline_text = self._extract_deadline(text)
+            deadline_text = self._extract_deadline(text, deadline_patterns)
         
         # If still no deadline, return None
         if not deadline_text:
             return None
         
         # Parse the deadline text into a structured format
-        return self._parse_deadline(deadline_text)
+        return self._parse_deadline(deadline_text, now)
     
     def _get_context_around_text(self, text, target, context_size=200):
         """
@@ -224,121 +559,147 @@ class WorkloadManager:
         if index == -1:
             return ""
         
-        start = max(0, index - context_size)
-        end = min(len(text), index + len(target) + context_size)
+        return self._get_context_around_span(text, index, index + len(target), context_size)
+    
+    def _get_context_around_span(self, text, start, end, context_size=200):
+        """
+        Get text context around a known span of the text.
         
-        return text[start:end]
+        Args:
+            text (str): Full text
+            start (int): Start index of the span
+            end (int): End index of the span (exclusive)
+            context_size (int): Number of characters to include before and after
+            
+        Returns:
+            str: Context text
+        """
+        return text[max(0, start - context_size):min(len(text), end + context_size)]
     
-    def _extract_deadline(self, text):
+    def _extract_deadline(self, text, deadline_patterns=None):
         """
         Extract deadline information from text.
         
         Args:
             text (str): Text to analyze
+            deadline_patterns (list): Deadline patterns to try (default: all)
             
         Returns:
             str: Extracted deadline text or None
         """
-        for pattern in self.deadline_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        if deadline_patterns is None:
+            deadline_patterns = self.deadline_patterns
+        
+        for pattern in deadline_patterns:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
         return None
     
-    def _parse_deadline(self, deadline_text):
+    def _match_deadline_keyword(self, deadline_text):
+        """
+        Find the relative deadline expression that takes precedence in the text.
+        
+        Args:
+            deadline_text (str): Deadline text
+            
+        Returns:
+            tuple: (expression name, first match of it), or (None, None)
+        """
+        best_keyword, best_match = None, None
+        for match in _DEADLINE_KEYWORD_RE.finditer(deadline_text):
+            keyword = match.lastgroup
+            if best_keyword is None or _DEADLINE_KEYWORD_PRECEDENCE[keyword] < _DEADLINE_KEYWORD_PRECEDENCE[best_keyword]:
+                best_keyword, best_match = keyword, match
+                if _DEADLINE_KEYWORD_PRECEDENCE[keyword] == 0:
+                    break
+        
+        return best_keyword, best_match
+    
+    def _parse_deadline(self, deadline_text, now=None):
         """
         Parse deadline text into structured format.
         
         Args:
             deadline_text (str): Deadline text
+            now (datetime.datetime): Reference time for relative deadlines (default: current time)
             
         Returns:
             dict: Structured deadline information
         """
-        try:
-            # Handle relative terms
+        if now is None:
             now = datetime.datetime.now()
+        
+        try:
+            # Handle relative terms with plain date arithmetic on today's date
+            today = now.date()
+            keyword, match = self._match_deadline_keyword(deadline_text)
+            deadline_time = _DEFAULT_DEADLINE_TIME
             
-            if re.search(r'\b(today)\b', deadline_text, re.IGNORECASE):
-                deadline_date = now.date()
-                deadline_time = datetime.time(17, 0)  # Default: 5:00 PM
+            if keyword == 'today':
+                deadline_date = today
                 
-            elif re.search(r'\b(tomorrow)\b', deadline_text, re.IGNORECASE):
-                tomorrow = now + datetime.timedelta(days=1)
-                deadline_date = tomorrow.date()
-                deadline_time = datetime.time(17, 0)  # Default: 5:00 PM
+            elif keyword == 'tomorrow':
+                deadline_date = today + datetime.timedelta(days=1)
                 
-            elif re.search(r'\b(this\s+week)\b', deadline_text, re.IGNORECASE):
+            elif keyword == 'this_week':
                 # End of this week (Friday)
-                days_until_friday = (4 - now.weekday()) % 7
+                days_until_friday = (4 - today.weekday()) % 7
                 if days_until_friday == 0:
                     days_until_friday = 7
-                friday = now + datetime.timedelta(days=days_until_friday)
-                deadline_date = friday.date()
-                deadline_time = datetime.time(17, 0)  # Default: 5:00 PM
+                deadline_date = today + datetime.timedelta(days=days_until_friday)
                 
-            elif re.search(r'\b(next\s+week)\b', deadline_text, re.IGNORECASE):
+            elif keyword == 'next_week':
                 # Middle of next week (Wednesday)
-                days_until_next_wednesday = (9 - now.weekday()) % 7
-                next_wednesday = now + datetime.timedelta(days=days_until_next_wednesday)
-                deadline_date = next_wednesday.date()
-                deadline_time = datetime.time(17, 0)  # Default: 5:00 PM
+                days_until_next_wednesday = (9 - today.weekday()) % 7
+                deadline_date = today + datetime.timedelta(days=days_until_next_wednesday)
                 
-            elif re.search(r'\b(this\s+month)\b', deadline_text, re.IGNORECASE):
+            elif keyword == 'this_month':
                 # End of this month
-                if now.month == 12:
-                    deadline_date = datetime.date(now.year, 12, 31)
+                if today.month == 12:
+                    deadline_date = datetime.date(today.year, 12, 31)
                 else:
-                    deadline_date = datetime.date(now.year, now.month + 1, 1) - datetime.timedelta(days=1)
-                deadline_time = datetime.time(17, 0)  # Default: 5:00 PM
+                    deadline_date = datetime.date(today.year, today.month + 1, 1) - datetime.timedelta(days=1)
                 
-            elif re.search(r'\bwithin\s+(\d+)\s+(day|days|week|weeks|month|months)\b', deadline_text, re.IGNORECASE):
+            elif keyword == 'within':
                 # Within X days/weeks/months
-                match = re.search(r'\bwithin\s+(\d+)\s+(day|days|week|weeks|month|months)\b', deadline_text, re.IGNORECASE)
-                amount = int(match.group(1))
-                unit = match.group(2).lower()
+                amount = int(match.group('amount'))
+                unit = match.group('within').lower()
                 
                 if unit in ['day', 'days']:
-                    deadline_date = (now + datetime.timedelta(days=amount)).date()
+                    deadline_date = today + datetime.timedelta(days=amount)
                 elif unit in ['week', 'weeks']:
-                    deadline_date = (now + datetime.timedelta(days=amount * 7)).date()
+                    deadline_date = today + datetime.timedelta(days=amount * 7)
                 elif unit in ['month', 'months']:
-                    deadline_date = (now + relativedelta(months=amount)).date()
+                    _, relativedelta = _get_dateutil()
+                    deadline_date = today + relativedelta(months=amount)
                 
-                deadline_time = datetime.time(17, 0)  # Default: 5:00 PM
-                
-            elif re.search(r'\bnext\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b', deadline_text, re.IGNORECASE):
+            elif keyword == 'weekday':
                 # Next specific day of week
-                match = re.search(r'\bnext\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b', deadline_text, re.IGNORECASE)
-                day_name = match.group(1).lower()
-                day_map = {'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4, 'saturday': 5, 'sunday': 6}
-                target_day = day_map.get(day_name, 0)
+                target_day = _WEEKDAY_NUMBERS.get(match.group('weekday').lower(), 0)
                 
-                days_until_day = (target_day - now.weekday()) % 7
+                days_until_day = (target_day - today.weekday()) % 7
                 if days_until_day == 0:
                     days_until_day = 7
                 
-                next_day = now + datetime.timedelta(days=days_until_day)
-                deadline_date = next_day.date()
-                deadline_time = datetime.time(17, 0)  # Default: 5:00 PM
+                deadline_date = today + datetime.timedelta(days=days_until_day)
                 
             else:
                 # Try to parse as a date
-                try:
-                    parsed_date = parser.parse(deadline_text, fuzzy=True)
+                parsed_date = _fuzzy_parse(deadline_text, today)
+                if parsed_date is not None:
                     deadline_date = parsed_date.date()
-                    deadline_time = parsed_date.time() if parsed_date.time() != datetime.time(0, 0) else datetime.time(17, 0)
-                except:
+                    if parsed_date.time() != datetime.time(0, 0):
+                        deadline_time = parsed_date.time()
+                else:
                     # If parsing fails, default to one week from now
-                    next_week = now + datetime.timedelta(days=7)
-                    deadline_date = next_week.date()
-                    deadline_time = datetime.time(17, 0)  # Default: 5:00 PM
+                    deadline_date = today + datetime.timedelta(days=7)
             
             # Create deadline object
             deadline = {
-                'date': deadline_date.strftime('%Y-%m-%d'),
-                'time': deadline_time.strftime('%H:%M'),
+                'date': deadline_date.isoformat(),
+                'time': deadline_time.isoformat(timespec='minutes'),
                 'datetime': datetime.datetime.combine(deadline_date, deadline_time),
                 'original_text': deadline_text
             }
@@ -347,15 +708,53 @@ class WorkloadManager:
             
         except Exception as e:
             # If any error occurs, return a default deadline (one week from now)
-            next_week = datetime.datetime.now() + datetime.timedelta(days=7)
+            next_week = now.date() + datetime.timedelta(days=7)
             return {
-                'date': next_week.date().strftime('%Y-%m-%d'),
+                'date': next_week.isoformat(),
                 'time': '17:00',
-                'datetime': datetime.datetime.combine(next_week.date(), datetime.time(17, 0)),
+                'datetime': datetime.datetime.combine(next_week, _DEFAULT_DEADLINE_TIME),
                 'original_text': deadline_text
             }
     
-    def _determine_task_priority(self, text, task_description, sender):
+    def _scan_urgency(self, context_lower):
+        """
+        Find the highest urgency level with an indicator in the context, in one pass.
+        
+        Args:
+            context_lower (str): Lowercased task context
+            
+        Returns:
+            str: Priority level, or None if no indicator occurs as a whole word
+        """
+        best_rank = None
+        for end, (rank, length) in self._urgency_automaton.iter(context_lower):
+            if (best_rank is None or rank < best_rank) and self._is_whole_word(context_lower, end - length + 1, end + 1):
+                best_rank = rank
+                if rank == 0:
+                    break
+        
+        return None if best_rank is None else self._urgency_patterns[best_rank][0]
+    
+    def _is_whole_word(self, text, start, end):
+        """
+        Check whether text[start:end] is bounded by non-word characters.
+        
+        Args:
+            text (str): Text containing the match
+            start (int): Start index of the match
+            end (int): End index of the match (exclusive)
+            
+        Returns:
+            bool: True if the match starts and ends on word boundaries
+        """
+        if start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+            return False
+        if end < len(text) and (text[end].isalnum() or text[end] == '_'):
+            return False
+        
+        return True
+    
+    def _determine_task_priority(self, text, task_description, sender, task_context=None):
         """
         Determine priority of a task.
         
@@ -363,17 +762,23 @@ class WorkloadManager:
             text (str): Email text
             task_description (str): Task description
             sender (str): Email sender
+            task_context (str): Text around the task description, if already known
             
         Returns:
             str: Priority level
         """
         # Get context around the task description
-        task_context = self._get_context_around_text(text, task_description, 200)
+        if task_context is None:
+            task_context = self._get_context_around_text(text, task_description, 200)
         
         # Check for urgency indicators
-        for priority, indicators in self.urgency_indicators.items():
-            for indicator in indicators:
-                if re.search(r'\b' + re.escape(indicator) + r'\b', task_context, re.IGNORECASE):
+        if self._urgency_automaton is not None and not _CASE_FOLD_ODDITIES_RE.search(task_context):
+            urgency = self._scan_urgency(task_context.lower())
+            if urgency is not None:
+                return urgency
+        else:
+            for priority, pattern in self._urgency_patterns:
+                if pattern.search(task_context):
                     return priority
         
         # Consider sender importance